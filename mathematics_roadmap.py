@@ -1,162 +1,20 @@
-import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
+import sys
 from typing import Dict, List
 
-class Book:
-    def __init__(self, title: str, author: str, category: str):
-        self.title = title
-        self.author = author 
-        self.category = category
-
-class Subject:
-    def __init__(self, name: str, category: str, books: List[Book]):
-        self.name = name
-        self.category = category
-        self.books = books
-
-COLORS = {
-    "essential": "#dae8fc",
-    "recommended": "#e1d5e7",
-    "optional": "#fff2cc"
-}
-
-BORDERS = {
-    "essential": "#6c8ebf", 
-    "recommended": "#9673a6",
-    "optional": "#d6b656"
-}
-
-def create_subjects():
-    subjects = {}
-
-    # Start points
-    subjects["Start1"] = Subject("Start Philosophy", "recommended", [])
-    subjects["Start2"] = Subject("Start Mathematics", "essential", [])
-
-    # Philosophy Track
-    subjects["IntroPhilosophy"] = Subject("Introduction to Philosophy", "recommended", [
-        Book("Think: A Compelling Introduction", "Simon Blackburn", "recommended"),
-        Book("Philosophy: A Text with Readings", "Manuel Velasquez", "recommended"),
-        Book("Thinking It Through", "Kwame Appiah", "recommended")
-    ])
-
-    subjects["IntroLogic"] = Subject("Introduction to Logic", "recommended", [
-        Book("The Power of Logic", "Howard-Snyder et al", "recommended"),
-        Book("A Concise Introduction to Logic", "Patrick J. Hurley", "recommended")
-    ])
-
-    # Core Mathematics
-    subjects["Precalculus"] = Subject("Precalculus", "essential", [
-        Book("Precalculus: Mathematics for Calculus", "Stewart et al", "essential"),
-        Book("Precalculus", "Michael Sullivan", "essential")
-    ])
-
-    subjects["Calculus"] = Subject("Calculus", "essential", [
-        Book("Calculus: Early Transcendentals", "James Stewart", "essential"),
-        Book("Thomas' Calculus", "George B. Thomas Jr.", "essential"),
-        Book("Infinite Powers", "Steven Strogatz", "recommended")
-    ])
-
-    # Add more subjects
-    # ... [Would you like me to continue adding all subjects?]
-
-    return subjects
-
-def create_connections():
-    return [
-        # Core Philosophy Path
-        ("Start1", "IntroPhilosophy"),
-        ("IntroPhilosophy", "IntroLogic"),
-        # ... [Would you like me to continue with all connections?]
-    ]
-
-def create_math_roadmap():
-    G = nx.DiGraph()
-    
-    # Add nodes
-    subjects = create_subjects()
-    for subject_id, subject in subjects.items():
-        G.add_node(subject_id,
-                  name=subject.name,
-                  category=subject.category,
-                  books=[f"{b.title} by {b.author}" for b in subject.books])
-    
-    # Add edges
-    connections = create_connections()
-    for start, end in connections:
-        G.add_edge(start, end)
-        
-    return G
-
-def draw_math_roadmap(G):
-    fig, ax = plt.subplots(figsize=(24, 18))
-    
-    pos = nx.kamada_kawai_layout(G)
-    
-    # Draw nodes by category
-    for category in ["essential", "recommended", "optional"]:
-        nodelist = [n for n,attr in G.nodes(data=True) if attr["category"] == category]
-        nx.draw_networkx_nodes(G, pos,
-                             nodelist=nodelist,
-                             node_color=COLORS[category],
-                             edgecolors=BORDERS[category],
-                             node_size=3000,
-                             ax=ax)
-    
-    # Draw edges
-    nx.draw_networkx_edges(G, pos, 
-                          edge_color='gray',
-                          arrows=True,
-                          arrowsize=20,
-                          width=1.5,
-                          ax=ax)
-    
-    # Add labels
-    labels = {n: G.nodes[n]["name"] for n in G.nodes()}
-    nx.draw_networkx_labels(G, pos,
-                          labels,
-                          font_size=8,
-                          ax=ax)
-    
-    plt.title("Mathematics Learning Roadmap", fontsize=16, pad=20)
-    plt.axis('off')
-    plt.tight_layout()
-    
-    return fig
-
-def main():
-    st.title("Mathematics Learning Roadmap")
-    
-    G = create_math_roadmap()
-    fig = draw_math_roadmap(G)
-    
-    st.pyplot(fig)
-    
-    st.header("Book Recommendations by Subject")
-    subjects = create_subjects()
-    for subject_id, subject in subjects.items():
-        if subject.books:  # Only show subjects that have books
-            st.subheader(subject.name)
-            for book in subject.books:
-                st.write(f"- {book.title} by {book.author}")
-            st.write("---")
-
-if __name__ == "__main__":
-    main()
-
-
-from typing import Dict, List
-import networkx as nx
-import matplotlib.pyplot as plt
+# Plotting, Streamlit, networkx and the helper modules are imported inside the functions
+# that need them, so importing this module only defines the roadmap data.
 
 class Book:
+    __slots__ = ("title", "author", "category")
+
     def __init__(self, title: str, author: str, category: str):
         self.title = title
         self.author = author 
         self.category = category
 
 class Subject:
+    __slots__ = ("name", "category", "books")
+
     def __init__(self, name: str, category: str, books: List[Book]):
         self.name = name
         self.category = category
@@ -173,6 +31,7 @@ BORDERS = {
     "recommended": "#9673a6",
     "optional": "#d6b656"
 }
+
 subjects = {
     "Start1": Subject("Start Philosophy", "recommended", []),
     "Start2": Subject("Start Mathematics", "essential", []),
@@ -554,10 +413,35 @@ connections = [
     ("TopologyMotivation", "GeneralTopology"),
     ("AlgebraicTopology", "AlgebraicGeometry")
 ]
-def create_math_roadmap():
+tracks = {
+    "Philosophy": ["Start1", "IntroPhilosophy", "IntroLogic", "ProblemSolving",
+                   "PhilosophyLanguage", "PhilosophyMath"],
+    "Core Mathematics": ["Start2", "Precalculus", "Calculus", "Physics", "LinearAlgebra", "ProofsDiscrete"],
+    "Logic and Foundations": ["MathLogic", "SetTheory", "CategoryTheory", "UniversalAlgebra", "LatticeTheory"],
+    "Algebra": ["AdvancedLinearAlgebra", "NumberTheory", "AlgebraicNumbers"],
+    "Pure Mathematics": ["RealAnalysis", "ComplexAnalysis", "GeneralTopology", "FunctionalAnalysis"],
+    "Geometry": ["EuclideanGeometry", "DifferentialGeometry", "AdvancedDifferentialGeometry",
+                 "TopologyMotivation", "AlgebraicTopology", "AlgebraicGeometryMotivation", "AlgebraicGeometry"],
+    "Applied Mathematics": ["DifferentialEquations", "ProbabilityTheory", "Statistics", "AdvancedProbability",
+                            "AdvancedStatistics", "TimeSeriesAnalysis", "StochasticCalculus",
+                            "NumericalAnalysis", "OptimizationTheory", "ConvexOptimization"],
+    "Programming and Applications": ["ProgrammingPython"]
+}
+
+def create_subjects():
+    return subjects
+
+def create_connections():
+    return connections
+
+def create_math_roadmap(subjects=None, connections=None):
+    import networkx as nx
+
     G = nx.DiGraph()
     
     # Add nodes
+    if subjects is None:
+        subjects = create_subjects()
     for subject_id, subject in subjects.items():
         G.add_node(subject_id,
                   name=subject.name,
@@ -565,40 +449,138 @@ def create_math_roadmap():
                   books=[f"{b.title} by {b.author}" for b in subject.books])
     
     # Add edges
+    if connections is None:
+        connections = create_connections()
     for start, end in connections:
         G.add_edge(start, end)
         
     return G
 
-def draw_math_roadmap(G):
-    pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-    
-    plt.figure(figsize=(24,18))
-    
-    # Draw nodes by category
-    for category in ["essential", "recommended", "optional"]:
-        nodelist = [n for n,attr in G.nodes(data=True) if attr["category"] == category]
-        nx.draw_networkx_nodes(G, pos,
-                             nodelist=nodelist,
-                             node_color=COLORS[category],
-                             edgecolors=BORDERS[category],
-                             node_size=3000)
+def draw_math_roadmap(G, pos=None, layout="kamada_kawai", title="Mathematics Learning Roadmap"):
+    from roadmap_layout import compute_layout
+    from roadmap_profile import stage
+    from roadmap_render import render_roadmap
+
+    if pos is None:
+        with stage("layout"):
+            pos = compute_layout(G, layout, tracks=tracks)
     
-    # Draw edges
-    nx.draw_networkx_edges(G, pos, edge_color='gray', arrows=True, 
-                          arrowsize=20, width=1.5)
+    # Nodes, edges and arrowheads are each drawn as a single collection
+    with stage("render"):
+        return render_roadmap(G, pos, title=title)
+
+def build_roadmap_layout(subjects, connections, layout="kamada_kawai"):
+    from roadmap_layout import compute_layout
+    from roadmap_profile import stage
+
+    with stage("graph"):
+        G = create_math_roadmap(subjects, connections)
+    with stage("layout"):
+        return G, compute_layout(G, layout, tracks=tracks)
+
+def main():
+    import streamlit as st
+    from roadmap_profile import PROFILE_OUT, activate, from_environment
+
+    # Profiling is off unless asked for, here or through MATH_ROADMAP_PROFILE
+    profiler = from_environment(st.sidebar.checkbox("Show stage timings") or None)
+    with activate(profiler):
+        roadmap_page()
+
+    if profiler.enabled:
+        st.sidebar.markdown(profiler.summary_markdown())
+        st.sidebar.download_button("Timings (JSON)", profiler.to_json(), "roadmap-profile.json")
+        st.sidebar.download_button("Timings (OpenMetrics)", profiler.to_openmetrics(), "roadmap-profile.txt")
+        if PROFILE_OUT:
+            profiler.write(PROFILE_OUT)
+
+def roadmap_page():
+    import streamlit as st
+    from roadmap_cache import default_cache, roadmap_key
+    from roadmap_profile import current, stage
+
+    st.title("Mathematics Learning Roadmap")
+    current().watch_cache(default_cache())
     
-    # Add labels
-    labels = {n: G.nodes[n]["name"] for n in G.nodes()}
-    nx.draw_networkx_labels(G, pos, labels, font_size=8)
+    with stage("data"):
+        subjects = create_subjects()
+        connections = create_connections()
     
-    plt.title("Complete Mathematics Learning Roadmap", fontsize=16, pad=20)
-    plt.axis('off')
-    plt.tight_layout()
+    # Graph and layout are keyed on the data, so reruns reuse them until it changes
+    layout = "kamada_kawai"
+    key = roadmap_key(subjects, connections, tracks, layout=layout)
+    with stage("graph_and_layout"):
+        G, pos = default_cache().get_or_compute(key, lambda: build_roadmap_layout(subjects, connections, layout))
+    names = {subject_id: subject.name for subject_id, subject in subjects.items()}
+    focus = st.sidebar.selectbox("Focus on subject", [None] + list(names),
+                                 format_func=lambda subject_id: names.get(subject_id, "Whole roadmap"))
+    if focus is not None:
+        from roadmap_focus import draw_focus_view
+
+        radius = st.sidebar.slider("Steps around subject", 1, 6, 2)
+        with stage("draw"):
+            fig = draw_focus_view(G, focus, radius, pos)
+        with stage("pyplot"):
+            st.pyplot(fig)
+    elif st.sidebar.checkbox("Tiled view"):
+        from roadmap_tiles import TileRenderer, tile_viewer
+
+        # Kept across reruns so the renderer's arrays, content hash and in-memory tiles are reused
+        key = roadmap_key(subjects, connections, tracks, artifact=TileRenderer, layout=layout)
+        with stage("tiles"):
+            tile_viewer(default_cache().get_or_compute(key, lambda: TileRenderer(G, pos)))
+    else:
+        completed = st.sidebar.multiselect("Completed subjects", list(names), format_func=names.get)
+        if completed:
+            from roadmap_progress import ProgressGraph, draw_progress
+
+            # One shared graph for every session; each learner only contributes a bitset
+            graph = default_cache().get_or_compute(roadmap_key(subjects, connections, artifact=ProgressGraph),
+                                                   lambda: ProgressGraph(G))
+            progress = graph.mask(completed)
+            ready = sorted(names[node] for node in graph.unlocked(progress) if node in names)
+            st.markdown(f"**{graph.fraction_complete(progress):.0%} complete.** Ready to study next: "
+                        + (", ".join(ready) or "nothing, every subject is done"))
+            with stage("draw"):
+                fig = draw_progress(G, pos, graph, progress)
+        else:
+            with stage("draw"):
+                fig = draw_math_roadmap(G, pos)
+        with stage("pyplot"):
+            st.pyplot(fig)
     
-    return plt
+    from roadmap_search import SearchIndex, search_box
+
+    with stage("search"):
+        index = default_cache().get_or_compute(roadmap_key(subjects, connections, artifact=SearchIndex),
+                                               lambda: SearchIndex.from_subjects(subjects))
+        search_box(index)
+
+    from roadmap_listing import BookListing, listing_view
 
-# Create and visualize
-G = create_math_roadmap()
-plt = draw_math_roadmap(G)
-plt.show()
+    st.header("Book Recommendations by Subject")
+    with stage("listing"):
+        # The track filter groups by `tracks`, so an edit there has to change the key too
+        key = roadmap_key(subjects, connections, tracks, artifact=BookListing)
+        listing = default_cache().get_or_compute(key, lambda: BookListing(subjects, tracks))
+        listing_view(listing)
+
+def show_roadmap(layout="spring"):
+    import matplotlib.pyplot as plt
+
+    G = create_math_roadmap()
+    draw_math_roadmap(G, layout=layout, title="Complete Mathematics Learning Roadmap")
+    plt.show()
+
+def run():
+    # Entry point for `python mathematics_roadmap.py` and `streamlit run mathematics_roadmap.py`.
+    # The roadmap stays a set of top-level modules rather than a package, so scripts and the
+    # Streamlit app keep working from a plain checkout without installing anything.
+    # `streamlit run` has already imported streamlit; plain `python` gets the desktop window.
+    if "streamlit" in sys.modules:
+        main()
+    else:
+        show_roadmap()
+
+if __name__ == "__main__":
+    run()
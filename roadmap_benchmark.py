@@ -0,0 +1,181 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from roadmap_synthetic import generate_roadmap
+
+SIZES = [100, 1000, 10000, 100000, 1000000]
+
+# Largest roadmap each stage is run on; beyond that the stage is recorded as skipped
+STAGE_LIMITS = {
+    "generate": None,
+    "graph": None,
+    "compile": None,
+    "validate": None,
+    "search_index": None,
+    "listing": None,
+    "reachability": 100000,
+    "layout_kamada_kawai": 2000,
+    "layout_spring": 3000,
+    "layout_barnes_hut": 100000,
+    "layout_layered": 200000,
+    "render": 100000,
+}
+
+
+def measure(fn: Callable[[], object], memory: bool = True):
+    # Wall time from an untraced run; peak Python/NumPy allocation from a second, traced run,
+    # since tracemalloc itself slows allocation-heavy code down severalfold
+    gc.collect()
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    peak = None
+    if memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _render(G, pos):
+    import io
+
+    import matplotlib.pyplot as plt
+    from roadmap_render import render_roadmap
+
+    fig = render_roadmap(G, pos, labels=len(G) <= 10000)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=50)
+    plt.close(fig)
+    return buffer.tell()
+
+
+def _stages(n: int, seed: int) -> List[tuple]:
+    from mathematics_roadmap import COLORS, create_math_roadmap
+    from roadmap_compact import CompactRoadmap
+    from roadmap_layout import compute_layout
+    from roadmap_listing import BookListing
+    from roadmap_reachability import ReachabilityIndex
+    from roadmap_search import SearchIndex
+    from roadmap_validate import validate_roadmap
+
+    data = {}
+
+    def listing():
+        # Everything the Streamlit listing would send if every subject were on one page
+        books = BookListing(data["subjects"], data["tracks"])
+        return sum(len(books.markdown(subject_id)) for subject_id in data["subjects"])
+
+    def render():
+        # Rendering cost does not depend on layout quality, so any placement will do
+        rng = np.random.default_rng(seed)
+        return _render(data["G"], {node: rng.random(2) for node in data["G"]})
+
+    return [
+        ("generate", lambda: generate_roadmap(n, seed=seed), lambda result: data.update(
+            zip(("subjects", "connections", "tracks"), result))),
+        ("graph", lambda: create_math_roadmap(data["subjects"], data["connections"]),
+         lambda result: data.update(G=result)),
+        ("compile", lambda: CompactRoadmap.from_subjects(data["subjects"], data["connections"]), None),
+        ("validate", lambda: validate_roadmap(data["subjects"], data["connections"], COLORS), None),
+        ("search_index", lambda: SearchIndex.from_subjects(data["subjects"]), None),
+        ("listing", listing, None),
+        ("reachability", lambda: ReachabilityIndex(data["G"]), None),
+        ("layout_kamada_kawai", lambda: compute_layout(data["G"], "kamada_kawai"), None),
+        ("layout_spring", lambda: compute_layout(data["G"], "spring", seed=seed), None),
+        ("layout_barnes_hut", lambda: compute_layout(data["G"], "barnes_hut", seed=seed), None),
+        ("layout_layered", lambda: compute_layout(data["G"], "layered", tracks=data["tracks"]), None),
+        ("render", render, None),
+    ]
+
+
+def run_benchmarks(sizes: Sequence[int] = SIZES, seed: int = 0, stages: Optional[Sequence[str]] = None,
+                   memory: bool = True, limits: Dict[str, Optional[int]] = STAGE_LIMITS, log=None) -> List[Dict]:
+    results = []
+    for n in sizes:
+        edges = None
+        for name, fn, keep in _stages(n, seed):
+            required = name in ("generate", "graph")
+            if stages is not None and name not in stages and not required:
+                continue
+            record = {"stage": name, "subjects": n, "edges": edges, "seconds": None, "peak_bytes": None}
+            limit = limits.get(name)
+            if limit is not None and n > limit and not required:
+                record["status"] = "skipped"
+            else:
+                try:
+                    result, record["seconds"], record["peak_bytes"] = measure(fn, memory)
+                    record["status"] = "ok"
+                    if keep is not None:
+                        keep(result)
+                    if name == "generate":
+                        edges = record["edges"] = len(result[1])
+                except Exception as error:
+                    record["status"] = f"error: {type(error).__name__}: {error}"
+                    if required:
+                        results.append(record)
+                        break
+            results.append(record)
+            if log is not None:
+                log(record)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    import matplotlib
+    import networkx
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "networkx": networkx.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def _print_record(record: Dict):
+    seconds = "-" if record["seconds"] is None else f"{record['seconds']:.3f}s"
+    peak = "-" if record["peak_bytes"] is None else f"{record['peak_bytes'] / 2 ** 20:.1f} MiB"
+    print(f"{record['subjects']:>9} {record['stage']:<22} {seconds:>10} {peak:>12}  {record['status']}",
+          file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    parser = argparse.ArgumentParser(description="Benchmark every roadmap stage on synthetic roadmaps.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGE_LIMITS), default=None)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run that measures peak memory")
+    parser.add_argument("--output", default="-", help="JSON results file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.seed, args.stages, not args.no_memory, log=_print_record)
+    report = {"environment": environment(), "seed": args.seed, "results": results}
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "MATH_ROADMAP_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "mathematics-roadmap")
+)
+
+# Whole objects are pickled under these keys; bump whenever a cached class changes shape
+CACHE_VERSION = 4
+
+_MISSING = object()
+
+
+def roadmap_key(subjects: Dict[str, Any], connections: List[Tuple[str, str]],
+                tracks: Optional[Dict[str, List[str]]] = None, artifact: Optional[type] = None, **params) -> str:
+    # Canonical form of the data: anything that changes the graph or the layout changes the key.
+    # artifact is the class of the cached object, so entries of different classes never collide.
+    payload = {
+        "version": CACHE_VERSION,
+        "artifact": None if artifact is None else f"{artifact.__module__}.{artifact.__qualname__}",
+        "tracks": tracks,
+        "subjects": [
+            [subject_id, subject.name, subject.category,
+             [[b.title, b.author, b.category] for b in subject.books]]
+            for subject_id, subject in subjects.items()
+        ],
+        "connections": [list(edge) for edge in connections],
+        "params": params,
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class RoadmapCache:
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_entries: int = 32, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        # The default cache is shared by every Streamlit session thread; the lock guards the
+        # LRU and the counters, while disk reads and writes happen outside it
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Caches pickled along with their owner (e.g. a TileRenderer) keep only their settings
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state["_memory"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self._memory.get(key, _MISSING)
+            if value is not _MISSING:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.cache_dir is not None:
+            path = self._path(key)
+            try:
+                f = open(path, "rb")
+            except OSError:
+                value = _MISSING
+            else:
+                try:
+                    with f:
+                        value = pickle.load(f)
+                except Exception:
+                    # Truncated, corrupt, or pickled from classes that have since changed
+                    value = _MISSING
+                    self._discard(path)
+            if value is not _MISSING:
+                # Touch the file so disk eviction sees it as recently used
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key: str, value: Any):
+        self._remember(key, value)
+        if self.cache_dir is None:
+            return
+
+        # An unwritable cache directory only costs the disk copy, never the caller's result
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            # Unwritable directory, full disk, or a value that cannot be pickled
+            if tmp_path is not None:
+                self._discard(tmp_path)
+            return
+        self._evict_disk()
+
+    def _discard(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _evict_disk(self):
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Drop least recently used files until the directory fits the budget
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> RoadmapCache:
+    # Module-level instance so it survives Streamlit reruns of the app script
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = RoadmapCache()
+    return _default_cache
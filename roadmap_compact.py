@@ -0,0 +1,157 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CATEGORIES = ["essential", "recommended", "optional"]
+UNKNOWN_CATEGORY = -1
+
+
+class StringTable:
+    __slots__ = ("strings", "index")
+
+    def __init__(self, strings: Iterable[str] = ()):
+        self.strings = []
+        self.index = {}
+        for value in strings:
+            self.add(value)
+
+    def add(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self.index[value] = code
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+def _csr(n: int, sources: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    return offsets, targets[order].astype(np.int32)
+
+
+class CompactRoadmap:
+    # Subjects and books as parallel integer arrays over interned string tables.
+    # Subject i owns books[book_offsets[i]:book_offsets[i + 1]]; edges are CSR in both directions.
+    def __init__(self, ids: Sequence[str], names: np.ndarray, categories: np.ndarray,
+                 book_offsets: np.ndarray, book_titles: np.ndarray, book_authors: np.ndarray,
+                 book_categories: np.ndarray, edge_sources: np.ndarray, edge_targets: np.ndarray,
+                 strings: StringTable, category_names: Sequence[str] = CATEGORIES,
+                 csr: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None,
+                 layout: Optional[np.ndarray] = None):
+        self.ids = ids
+        self._id_index = None
+        self.names = names
+        self.categories = categories
+        self.book_offsets = book_offsets
+        self.book_titles = book_titles
+        self.book_authors = book_authors
+        self.book_categories = book_categories
+        self.edge_sources = edge_sources
+        self.edge_targets = edge_targets
+        self.strings = strings
+        self.category_names = category_names
+        if csr is None:
+            csr = _csr(len(ids), edge_sources, edge_targets) + _csr(len(ids), edge_targets, edge_sources)
+        self.succ_offsets, self.succ, self.pred_offsets, self.pred = csr
+        self.layout = layout
+
+    @classmethod
+    def from_subjects(cls, subjects, connections, category_names: List[str] = CATEGORIES) -> "CompactRoadmap":
+        strings = StringTable()
+        category_code = {name: i for i, name in enumerate(category_names)}
+        ids = list(subjects)
+        id_index = {subject_id: i for i, subject_id in enumerate(ids)}
+
+        # Connections may name subjects that were never defined; keep them as bare nodes
+        for start, end in connections:
+            for subject_id in (start, end):
+                if subject_id not in id_index:
+                    id_index[subject_id] = len(ids)
+                    ids.append(subject_id)
+
+        names = np.full(len(ids), -1, dtype=np.int32)
+        categories = np.full(len(ids), UNKNOWN_CATEGORY, dtype=np.int8)
+        book_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        titles, authors, book_categories = [], [], []
+        for i, subject_id in enumerate(ids):
+            subject = subjects.get(subject_id)
+            if subject is not None:
+                names[i] = strings.add(subject.name)
+                categories[i] = category_code.get(subject.category, UNKNOWN_CATEGORY)
+                for book in subject.books:
+                    titles.append(strings.add(book.title))
+                    authors.append(strings.add(book.author))
+                    book_categories.append(category_code.get(book.category, UNKNOWN_CATEGORY))
+            book_offsets[i + 1] = len(titles)
+
+        edges = np.array([(id_index[start], id_index[end]) for start, end in connections],
+                         dtype=np.int32).reshape(-1, 2)
+        return cls(ids, names, categories, book_offsets,
+                   np.array(titles, dtype=np.int32), np.array(authors, dtype=np.int32),
+                   np.array(book_categories, dtype=np.int8), edges[:, 0], edges[:, 1],
+                   strings, category_names)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def id_index(self) -> Dict[str, int]:
+        if self._id_index is None:
+            self._id_index = {subject_id: i for i, subject_id in enumerate(self.ids)}
+        return self._id_index
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.edge_sources)
+
+    def name(self, i: int) -> str:
+        code = self.names[i]
+        return self.strings[code] if code >= 0 else ""
+
+    def category(self, i: int) -> str:
+        code = self.categories[i]
+        return self.category_names[code] if code >= 0 else ""
+
+    def successors(self, i: int) -> np.ndarray:
+        return self.succ[self.succ_offsets[i]:self.succ_offsets[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.pred[self.pred_offsets[i]:self.pred_offsets[i + 1]]
+
+    def book_count(self, i: int) -> int:
+        return int(self.book_offsets[i + 1] - self.book_offsets[i])
+
+    def books(self, i: int) -> List[Tuple[str, str, str]]:
+        start, end = self.book_offsets[i], self.book_offsets[i + 1]
+        return [(self.strings[self.book_titles[b]], self.strings[self.book_authors[b]],
+                 self.category_names[self.book_categories[b]] if self.book_categories[b] >= 0 else "")
+                for b in range(start, end)]
+
+    def positions(self) -> Optional[Dict[Hashable, np.ndarray]]:
+        if self.layout is None:
+            return None
+        return dict(zip(self.ids, self.layout))
+
+    def to_networkx(self):
+        # Same node attributes as create_math_roadmap(); built on demand only
+        import networkx as nx
+
+        G = nx.DiGraph()
+        for i, subject_id in enumerate(self.ids):
+            if self.names[i] < 0:
+                continue
+            G.add_node(subject_id,
+                       name=self.name(i),
+                       category=self.category(i),
+                       books=[f"{title} by {author}" for title, author, _ in self.books(i)])
+        ids = self.ids
+        G.add_edges_from((ids[u], ids[v]) for u, v in zip(self.edge_sources.tolist(), self.edge_targets.tolist()))
+        return G
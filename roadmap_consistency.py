@@ -0,0 +1,264 @@
+import ast
+import hashlib
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from roadmap_drawio import read_drawio
+
+# Every source is reduced to the same shape before comparing:
+#   subjects:    {subject_id: (name, category, [(title, author, category), ...])}
+#   connections: [(start_id, end_id), ...]
+# Subjects are matched across sources by their normalized name.
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_NAME_PREFIXES = ("introduction to the ", "introduction to ")
+_MD_HEADING = re.compile(r"^#+\s*\*\*(.*?)\*\*\s*$")
+_MD_CATEGORY = re.compile(r"\((optional but recommended|optional)\)\.?", re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    text = text.casefold().replace("&", " and ")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def subject_key(name: str) -> str:
+    key = normalize(name)
+    for prefix in _NAME_PREFIXES:
+        if key.startswith(prefix):
+            return key[len(prefix):]
+    return key
+
+
+def record_hash(category: str, books: Iterable[Tuple[str, str, str]]) -> str:
+    canonical = sorted((normalize(title), normalize(author)) for title, author, _ in books)
+    return hashlib.sha1(repr((category, canonical)).encode("utf-8")).hexdigest()
+
+
+class Issue:
+    def __init__(self, kind: str, subject: str, message: str):
+        self.kind = kind
+        self.subject = subject
+        self.message = message
+
+    def __repr__(self):
+        return f"Issue({self.kind!r}, {self.subject!r}, {self.message!r})"
+
+    def __str__(self):
+        return f"[{self.kind}] {self.subject}: {self.message}"
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _call_name(node) -> Optional[str]:
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id
+    return None
+
+
+def _subject_from_call(node):
+    args = [_literal(arg) for arg in node.args[:2]]
+    if len(node.args) < 3 or not all(isinstance(arg, str) for arg in args):
+        return None
+    books = []
+    for item in getattr(node.args[2], "elts", []):
+        if _call_name(item) == "Book":
+            title, author, category = (_literal(arg) for arg in item.args[:3])
+            books.append((title, author, category))
+    return args[0], args[1], books
+
+
+def parse_python_source(text: str):
+    # Static read of Subject(...)/Book(...) literals, so the module never has to be imported
+    subjects, connections, colors = {}, [], {}
+    for node in ast.walk(ast.parse(text)):
+        if isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                if isinstance(key, ast.Constant) and _call_name(value) == "Subject":
+                    record = _subject_from_call(value)
+                    if record is not None:
+                        subjects[key.value] = record
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Subscript) and _call_name(node.value) == "Subject":
+                key = _literal(target.slice)
+                record = _subject_from_call(node.value)
+                if isinstance(key, str) and record is not None:
+                    subjects[key] = record
+            elif isinstance(target, ast.Name) and target.id == "connections":
+                value = _literal(node.value)
+                if isinstance(value, list):
+                    connections = [tuple(edge) for edge in value]
+            elif isinstance(target, ast.Name) and target.id == "COLORS":
+                value = _literal(node.value)
+                if isinstance(value, dict):
+                    colors = value
+    return subjects, connections, colors
+
+
+def parse_topics_markdown(lines: Iterable[str]):
+    subjects = {}
+    current = None
+    paragraph = []
+
+    def flush():
+        if current is None or not paragraph:
+            return
+        if len(paragraph) == 1:
+            title, _, author = paragraph[0].rpartition(", ")
+            title, author = (title, author) if title else (paragraph[0], "")
+        else:
+            title, author = paragraph[0], " ".join(paragraph[1:])
+        category = subjects[current][1]
+        match = _MD_CATEGORY.search(author) or _MD_CATEGORY.search(title)
+        if match:
+            category = "optional" if match.group(1).lower() == "optional" else "recommended"
+            title, author = _MD_CATEGORY.sub("", title).strip(), _MD_CATEGORY.sub("", author).strip()
+        subjects[current][2].append((title, author, category))
+        paragraph.clear()
+
+    for line in lines:
+        line = line.strip()
+        heading = _MD_HEADING.match(line)
+        if heading:
+            flush()
+            name = heading.group(1).rstrip(":").strip()
+            match = _MD_CATEGORY.search(name)
+            category = "essential"
+            if match:
+                category = "optional" if match.group(1).lower() == "optional" else "recommended"
+                name = _MD_CATEGORY.sub("", name).strip()
+            current = name
+            subjects[current] = (name, category, [])
+        elif not line or line == "***":
+            flush()
+        else:
+            paragraph.append(line)
+    flush()
+    return subjects, []
+
+
+def _books_by_title(books: Iterable[Tuple[str, str, str]]) -> Dict[str, List[Tuple[str, str]]]:
+    grouped = {}
+    for title, author, _ in books:
+        grouped.setdefault(normalize(title), []).append((title, author))
+    return grouped
+
+
+def _unmatched(books: List[Tuple[str, str]], others: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # Books with no same-author counterpart among others, counted as a multiset
+    available = Counter(normalize(author) for _, author in others)
+    unmatched = []
+    for title, author in books:
+        key = normalize(author)
+        if available[key]:
+            available[key] -= 1
+        else:
+            unmatched.append((title, author))
+    return unmatched
+
+
+class ConsistencyChecker:
+    # Parsed sources are cached by file signature, so a re-check after saving one file
+    # only re-parses that file and reuses the per-subject hashes of the others.
+    def __init__(self, py_path: str, md_path: str, drawio_path: str):
+        self.paths = {"py": py_path, "md": md_path, "drawio": drawio_path}
+        self._sources = {}
+        self._signatures = {}
+        self._report = None
+
+    def _parse(self, source: str, path: str):
+        if source == "md":
+            with open(path, encoding="utf-8") as f:
+                return parse_topics_markdown(f)
+        if source == "py":
+            with open(path, encoding="utf-8") as f:
+                subjects, connections, _ = parse_python_source(f.read())
+            return subjects, connections
+        return read_drawio(path, self._colors())
+
+    def _colors(self) -> Dict[str, str]:
+        with open(self.paths["py"], encoding="utf-8") as f:
+            return parse_python_source(f.read())[2]
+
+    def refresh(self) -> List[str]:
+        changed = []
+        for source, path in self.paths.items():
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._signatures.get(source) == signature:
+                continue
+            subjects, connections = self._parse(source, path)
+            by_key = {}
+            for subject_id, (name, category, books) in subjects.items():
+                by_key[subject_key(name)] = (subject_id, name, category, books, record_hash(category, books))
+            self._sources[source] = (subjects, connections, by_key)
+            self._signatures[source] = signature
+            changed.append(source)
+        if changed:
+            self._report = None
+        return changed
+
+    def check(self) -> List[Issue]:
+        self.refresh()
+        if self._report is None:
+            self._report = self._compare()
+        return self._report
+
+    def _compare(self) -> List[Issue]:
+        issues = []
+        sources = list(self.paths)
+
+        for source in sources:
+            subjects, connections, _ = self._sources[source]
+            for start, end in connections:
+                for endpoint in (start, end):
+                    if endpoint not in subjects:
+                        issues.append(Issue("dangling_connection", endpoint,
+                                            f"{source} connection {start} -> {end} names an undefined subject"))
+
+        keys = {}
+        for source in sources:
+            for key in self._sources[source][2]:
+                keys.setdefault(key, None)
+
+        for key in keys:
+            present = [source for source in sources if key in self._sources[source][2]]
+            records = {source: self._sources[source][2][key] for source in present}
+            name = records[present[0]][1]
+            missing = [source for source in sources if source not in records]
+            if missing:
+                issues.append(Issue("missing_subject", name,
+                                    f"present in {', '.join(present)}; missing from {', '.join(missing)}"))
+
+            for i, left in enumerate(present):
+                for right in present[i + 1:]:
+                    if records[left][4] != records[right][4]:
+                        issues.extend(self._diff_subject(name, left, records[left], right, records[right]))
+        return issues
+
+    def _diff_subject(self, name, left, left_record, right, right_record) -> List[Issue]:
+        issues = []
+        if left_record[2] != right_record[2]:
+            issues.append(Issue("category_mismatch", name,
+                                f"{left} says {left_record[2]}, {right} says {right_record[2]}"))
+
+        # Books are matched on title and author, so one title listed under two authors in a
+        # subject is two books; an author mismatch is only reported for books left unmatched
+        left_books, right_books = _books_by_title(left_record[3]), _books_by_title(right_record[3])
+        for title_key in dict.fromkeys(list(left_books) + list(right_books)):
+            left_only = _unmatched(left_books.get(title_key, []), right_books.get(title_key, []))
+            right_only = _unmatched(right_books.get(title_key, []), left_books.get(title_key, []))
+            for (title, author), (_, other) in zip(left_only, right_only):
+                issues.append(Issue("author_mismatch", name, f"{title!r}: {left} has {author!r}, {right} has {other!r}"))
+            for title, author in left_only[len(right_only):]:
+                issues.append(Issue("book_mismatch", name, f"{title!r} by {author} is in {left} but not {right}"))
+            for title, author in right_only[len(left_only):]:
+                issues.append(Issue("book_mismatch", name, f"{title!r} by {author} is in {right} but not {left}"))
+        return issues
@@ -0,0 +1,291 @@
+import base64
+import html
+import io
+import math
+import os
+import re
+import tempfile
+import zlib
+from typing import Dict, Hashable, Iterator, List, Optional, TextIO, Tuple
+from urllib.parse import unquote
+from xml.etree.ElementTree import iterparse
+
+BookRecord = Tuple[str, str, str]
+SubjectRecord = Tuple[str, str, List[BookRecord]]
+
+_TAG = re.compile(r"<[^>]*>")
+_BOLD = re.compile(r"<b>(.*?)</b>", re.IGNORECASE | re.DOTALL)
+_BREAK = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+_WRAPPERS = ("object", "UserObject")
+# Data attributes write_drawio puts on subject wrappers: the roadmap id, and a flag for ids
+# that connections name but no subject defines
+_ROADMAP_ATTRS = ("subject", "undefined")
+
+# Written diagrams: subject swimlanes with one box per book stacked inside, sized like
+# the hand-drawn file
+LANE_WIDTH = 220
+LANE_HEADER = 30
+BOOK_HEIGHT = 60
+BOOK_GAP = 10
+UNKNOWN_FILL = "#ffffff"
+UNKNOWN_BORDER = "#999999"
+
+
+def _style(style: Optional[str]) -> Dict[str, str]:
+    result = {}
+    for part in (style or "").split(";"):
+        key, sep, value = part.partition("=")
+        result[key] = value if sep else ""
+    return result
+
+
+def _text(value: str) -> str:
+    text = _TAG.sub("", _BREAK.sub(" ", value))
+    return " ".join(html.unescape(text).split())
+
+
+def parse_book_label(value: str) -> Tuple[str, str]:
+    # Book cells read "Title<br><b>Author</b>", possibly wrapped in div/span markup
+    match = _BOLD.search(value)
+    if match is None:
+        return _text(value), ""
+    return _text(value[:match.start()]), _text(match.group(1))
+
+
+def _decode_diagram(text: str) -> bytes:
+    # Compressed pages are base64 of raw deflate of the URL-encoded model XML
+    data = zlib.decompress(base64.b64decode(text), -zlib.MAX_WBITS)
+    return unquote(data.decode("utf-8")).encode("utf-8")
+
+
+def iter_cells(source) -> Iterator[Tuple[int, Dict[str, str]]]:
+    # Yields (page, attributes) for every mxCell without keeping the parsed tree around
+    page = -1
+    container = None
+    wrapper = None
+    for event, elem in iterparse(source, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == "diagram":
+                page += 1
+            elif tag == "root":
+                container = elem
+            elif tag in _WRAPPERS:
+                wrapper = dict(elem.attrib)
+            continue
+
+        if tag == "mxCell":
+            attrib = dict(elem.attrib)
+            if wrapper is not None:
+                attrib["id"] = wrapper.get("id", attrib.get("id"))
+                attrib["value"] = wrapper.get("label", attrib.get("value", ""))
+                for name in _ROADMAP_ATTRS:
+                    if name in wrapper:
+                        attrib[name] = wrapper[name]
+            yield max(page, 0), attrib
+            if wrapper is None and container is not None:
+                container.clear()
+        elif tag in _WRAPPERS:
+            wrapper = None
+            if container is not None:
+                container.clear()
+        elif tag == "diagram":
+            if len(elem) == 0 and (elem.text or "").strip():
+                for _, attrib in iter_cells(io.BytesIO(_decode_diagram(elem.text.strip()))):
+                    yield page, attrib
+            elem.clear()
+            container = None
+
+
+def read_drawio(source, colors: Dict[str, str]) -> Tuple[Dict[str, SubjectRecord], List[Tuple[str, str]]]:
+    category_of_fill = {fill.lower(): category for category, fill in colors.items()}
+    subjects = {}
+    connections = []
+
+    def key(page, cell_id):
+        # Cell ids are only unique within a page
+        return cell_id if page == 0 else f"{page}:{cell_id}"
+
+    def flush(page, parents, owners, books, edges):
+        # Edges may point at a book or a label inside a subject; walk up to the subject
+        def owner(cell_id):
+            seen = 0
+            while cell_id is not None and cell_id not in owners and seen < 64:
+                cell_id = parents.get(cell_id)
+                seen += 1
+            return owners.get(cell_id)
+
+        for parent_id, book in books:
+            subject_id = owner(parent_id)
+            if subject_id in subjects:
+                subjects[subject_id][2].append(book)
+        for source_id, target_id in edges:
+            start, end = owner(source_id), owner(target_id)
+            if start is not None and end is not None and start != end:
+                connections.append((start, end))
+
+    # owners maps the cell ids of a page to the subject id they stand for
+    page = 0
+    parents, owners, books, edges, layers = {}, {}, [], [], set()
+    for cell_page, attrib in iter_cells(source):
+        if cell_page != page:
+            flush(page, parents, owners, books, edges)
+            page = cell_page
+            parents, owners, books, edges, layers = {}, {}, [], [], set()
+
+        cell_id = attrib.get("id")
+        parent_id = attrib.get("parent")
+        parents[cell_id] = parent_id
+        if parent_id is None or parents.get(parent_id, "") is None:
+            # The model's root cell and the layer cells directly under it
+            layers.add(cell_id)
+            continue
+        if attrib.get("edge") == "1":
+            # Two-way "interrelation" arrows are kept in drawing direction, as in connections
+            if attrib.get("source") and attrib.get("target"):
+                edges.append((attrib["source"], attrib["target"]))
+            continue
+        if attrib.get("vertex") != "1":
+            continue
+        if attrib.get("undefined") == "1":
+            # Kept only so its connections survive; it is not a subject
+            owners[cell_id] = key(page, attrib.get("subject", cell_id))
+            continue
+
+        style = _style(attrib.get("style"))
+        category = category_of_fill.get(style.get("fillColor", "").lower())
+        if category is None or "text" in style:
+            continue
+        value = attrib.get("value", "")
+        if "swimlane" in style or parent_id in layers:
+            subject_id = key(page, attrib.get("subject", cell_id))
+            subjects[subject_id] = (_text(value), category, [])
+            owners[cell_id] = subject_id
+        else:
+            title, author = parse_book_label(value)
+            books.append((parents[cell_id], (title, author, category)))
+
+    flush(page, parents, owners, books, edges)
+    return subjects, connections
+
+
+def drawio_to_graph(source, colors: Dict[str, str]):
+    import networkx as nx
+
+    subjects, connections = read_drawio(source, colors)
+    G = nx.DiGraph()
+    for subject_id, (name, category, books) in subjects.items():
+        G.add_node(subject_id,
+                   name=name,
+                   category=category,
+                   books=[f"{title} by {author}" for title, author, _ in books])
+    G.add_edges_from(connections)
+    return G
+
+
+def _attr(value) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _books(G, subjects, subject_id) -> List[Tuple[str, str, Optional[str]]]:
+    # Subject records carry each book's own category; graph nodes only have "Title by Author"
+    if subjects is not None and subject_id in subjects:
+        return [(book.title, book.author, book.category) for book in subjects[subject_id].books]
+    books = []
+    for label in G.nodes[subject_id].get("books", []):
+        title, sep, author = label.rpartition(" by ")
+        books.append((title, author, None) if sep else (label, "", None))
+    return books
+
+
+def _write_cells(f: TextIO, G, pos: Dict[Hashable, Tuple[float, float]], colors: Dict[str, str],
+                 borders: Dict[str, str], subjects, scale: Optional[float]):
+    xs = [float(pos[node][0]) for node in G]
+    ys = [float(pos[node][1]) for node in G]
+    left, top = (min(xs), max(ys)) if xs else (0.0, 0.0)
+    if scale is None:
+        # Roughly a lane width of space per node along each side of the square
+        span = max(max(xs) - left, top - min(ys), 1e-9) if xs else 1.0
+        scale = LANE_WIDTH * 2 * math.sqrt(max(len(G), 1)) / span
+
+    # Escaped once here; edges and books refer back to their subject's id. The prefix keeps
+    # subject cells clear of the model's own "0"/"1" cells and of edge and book ids.
+    ids = {node: _attr(node) for node in G}
+    f.write('<mxCell id="0" />\n<mxCell id="1" parent="0" />\n')
+    for node, x, y in zip(G, xs, ys):
+        attr = G.nodes[node]
+        cell_id = f"subject-{ids[node]}"
+        defined = "name" in attr
+        category = attr.get("category")
+        fill, stroke = colors.get(category, UNKNOWN_FILL), borders.get(category, UNKNOWN_BORDER)
+        books = _books(G, subjects, node) if defined else []
+        height = LANE_HEADER + BOOK_GAP + len(books) * (BOOK_HEIGHT + BOOK_GAP)
+        # Ids that only connections name are drawn dashed and flagged, so read_drawio keeps
+        # their connections without mistaking them for subjects
+        marker = "" if defined else ' undefined="1"'
+        dashed = "" if defined else "dashed=1;"
+        # Layouts are y-up, draw.io is y-down; the node position is the lane's centre
+        f.write(f'<object id="{cell_id}" label="{_attr(attr.get("name", node))}" subject="{ids[node]}"{marker}>\n'
+                f'<mxCell style="swimlane;{dashed}fillColor={fill};strokeColor={stroke};" parent="1" vertex="1">\n'
+                f'<mxGeometry x="{round((x - left) * scale - LANE_WIDTH / 2)}" '
+                f'y="{round((top - y) * scale - height / 2)}" width="{LANE_WIDTH}" height="{height}" '
+                f'as="geometry" />\n</mxCell>\n</object>\n')
+        for i, (title, author, book_category) in enumerate(books):
+            book_category = book_category or category
+            label = html.escape(title) + (f"<br><b>{html.escape(author)}</b>" if author else "")
+            f.write(f'<mxCell id="book-{ids[node]}-{i}" value="{_attr(label)}" '
+                    f'style="rounded=0;whiteSpace=wrap;html=1;fillColor={colors.get(book_category, UNKNOWN_FILL)};'
+                    f'strokeColor={borders.get(book_category, UNKNOWN_BORDER)};" parent="{cell_id}" vertex="1">\n'
+                    f'<mxGeometry x="{BOOK_GAP}" y="{LANE_HEADER + BOOK_GAP + i * (BOOK_HEIGHT + BOOK_GAP)}" '
+                    f'width="{LANE_WIDTH - 2 * BOOK_GAP}" height="{BOOK_HEIGHT}" as="geometry" />\n</mxCell>\n')
+
+    for u, v in G.edges():
+        stroke = borders.get(G.nodes[u].get("category"), UNKNOWN_BORDER)
+        f.write(f'<mxCell id="edge-{ids[u]}--{ids[v]}" style="endArrow=classic;html=1;strokeColor={stroke};" '
+                f'parent="1" source="subject-{ids[u]}" target="subject-{ids[v]}" edge="1">\n'
+                f'<mxGeometry relative="1" as="geometry" />\n</mxCell>\n')
+
+
+def write_drawio(target, G, pos: Dict[Hashable, Tuple[float, float]], colors: Optional[Dict[str, str]] = None,
+                 borders: Optional[Dict[str, str]] = None, subjects=None, scale: Optional[float] = None,
+                 name: str = "Page-1"):
+    # Streams G as an uncompressed single-page diagram that read_drawio reads back to the
+    # same subject ids, names, books and connections, including connections to ids no
+    # subject defines. Each subject is an <object> whose "subject" attribute holds its
+    # roadmap id, shown in draw.io's Edit Data dialog. Cell ids derive from subject ids and
+    # cells are written in graph order, so regenerating after a data change only touches
+    # the lines of what changed. target is a path (replaced atomically) or a text file.
+    # subjects, when given, supplies each book's own category; pos can come from any layout.
+    if colors is None or borders is None:
+        from mathematics_roadmap import BORDERS, COLORS
+
+        colors = COLORS if colors is None else colors
+        borders = BORDERS if borders is None else borders
+    missing = [node for node in G if node not in pos]
+    if missing:
+        raise ValueError(f"No position for {len(missing)} subject(s), e.g. {missing[0]!r}")
+
+    if not isinstance(target, (str, os.PathLike)):
+        _write_document(target, G, pos, colors, borders, subjects, scale, name)
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            _write_document(f, G, pos, colors, borders, subjects, scale, name)
+        # mkstemp creates the file owner-only; give it the permissions a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_document(f: TextIO, G, pos, colors, borders, subjects, scale, name):
+    f.write(f'<mxfile host="mathematics_roadmap">\n<diagram id="roadmap" name="{_attr(name)}">\n'
+            '<mxGraphModel grid="1" gridSize="10" guides="1" tooltips="1" connect="1" arrows="1" fold="1" '
+            'page="0" pageScale="1" math="0" shadow="0">\n<root>\n')
+    _write_cells(f, G, pos, colors, borders, subjects, scale)
+    f.write("</root>\n</mxGraphModel>\n</diagram>\n</mxfile>\n")
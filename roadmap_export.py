@@ -0,0 +1,191 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMATS = ("png", "svg", "pdf")
+MANIFEST = "manifest.json"
+# Render settings; they go into every job hash with the palette, so changing any of them
+# re-renders the images. Bump EXPORT_VERSION when the drawing code itself changes.
+EXPORT_VERSION = 1
+TRACK_FIGSIZE = (16, 12)
+FOCUS_FIGSIZE = (12, 9)
+NODE_SIZE = 3000
+
+# Set once per worker process by _init_worker
+_G = None
+_POS = None
+_TRACKS = None
+_RADIUS = 2
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "-", text.casefold()).strip("-")
+
+
+def _job_hash(G, pos: Dict[Hashable, np.ndarray], nodes: Sequence[Hashable], params) -> str:
+    # Everything the image depends on: the drawn nodes, their data and coordinates, and the edges among them
+    members = set(nodes)
+    payload = {
+        "nodes": [[str(node), G.nodes[node].get("name"), G.nodes[node].get("category"),
+                   [round(float(c), 6) for c in pos[node]]] for node in sorted(members, key=str)],
+        "edges": sorted([str(u), str(v)] for u, v in G.edges() if u in members and v in members),
+        "params": params,
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _style():
+    from mathematics_roadmap import BORDERS, COLORS
+    from roadmap_render import UNKNOWN_BORDER, UNKNOWN_FILL
+
+    return {"version": EXPORT_VERSION, "colors": COLORS, "borders": BORDERS,
+            "unknown": [UNKNOWN_FILL, UNKNOWN_BORDER], "node_size": NODE_SIZE}
+
+
+def plan_exports(G, pos: Dict[Hashable, np.ndarray], tracks: Dict[str, List[Hashable]],
+                 subjects: Optional[Sequence[Hashable]] = None, radius: int = 2,
+                 formats: Sequence[str] = FORMATS) -> List[Tuple[str, str, Hashable, str, List[str]]]:
+    # One job per image: (basename, kind, target, input hash, formats)
+    from roadmap_focus import neighborhood
+
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    style = _style()
+    jobs = []
+    for track, members in tracks.items():
+        nodes = [node for node in members if node in G]
+        if nodes:
+            jobs.append((f"track-{_slug(track)}", "track", track,
+                         _job_hash(G, pos, nodes, ["track", track, TRACK_FIGSIZE, style]), list(formats)))
+    for subject in (G if subjects is None else subjects):
+        if "name" not in G.nodes[subject]:
+            continue
+        nodes = neighborhood(G, subject, radius)
+        jobs.append((f"subject-{_slug(str(subject))}", "subject", subject,
+                     _job_hash(G, pos, nodes, ["subject", str(subject), radius, FOCUS_FIGSIZE, style]),
+                     list(formats)))
+    return jobs
+
+
+def _init_worker(G, pos, tracks, radius: int):
+    global _G, _POS, _TRACKS, _RADIUS
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+    _G, _POS, _TRACKS, _RADIUS = G, pos, tracks, radius
+
+
+def _render_job(output_dir: str, basename: str, kind: str, target: Hashable, formats: List[str]) -> List[str]:
+    # One figure per job, saved once per requested format
+    import matplotlib.pyplot as plt
+    from roadmap_focus import draw_focus_view
+    from roadmap_render import render_roadmap
+
+    if kind == "track":
+        H = _G.subgraph(node for node in _TRACKS[target] if node in _G)
+        fig = render_roadmap(H, {node: _POS[node] for node in H}, figsize=TRACK_FIGSIZE, node_size=NODE_SIZE,
+                             title=target)
+    else:
+        fig = draw_focus_view(_G, target, _RADIUS, _POS, figsize=FOCUS_FIGSIZE, node_size=NODE_SIZE)
+    paths = []
+    try:
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{basename}.{fmt}")
+            fig.savefig(path, format=fmt)
+            paths.append(path)
+    finally:
+        plt.close(fig)
+    return paths
+
+
+def _read_manifest(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_manifest(path: str, manifest: Dict[str, Dict]):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def export_images(output_dir: str, G, pos: Dict[Hashable, np.ndarray], tracks: Dict[str, List[Hashable]],
+                  subjects: Optional[Sequence[Hashable]] = None, radius: int = 2,
+                  formats: Sequence[str] = FORMATS, workers: Optional[int] = None, force: bool = False):
+    # Outputs whose input hash matches the manifest and whose file still exists are skipped;
+    # the rest are rendered in a process pool. Returns (rendered, skipped) file names.
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    previous = _read_manifest(manifest_path)
+
+    manifest, pending, skipped = {}, [], []
+    for basename, kind, target, digest, job_formats in plan_exports(G, pos, tracks, subjects, radius, formats):
+        stale = []
+        for fmt in job_formats:
+            name = f"{basename}.{fmt}"
+            manifest[name] = {"kind": kind, "target": str(target), "format": fmt, "hash": digest}
+            entry = previous.get(name)
+            if force or entry is None or entry.get("hash") != digest or \
+                    not os.path.exists(os.path.join(output_dir, name)):
+                stale.append(fmt)
+            else:
+                skipped.append(name)
+        if stale:
+            pending.append((basename, kind, target, stale))
+
+    rendered = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(G, pos, tracks, radius)) as pool:
+            futures = [pool.submit(_render_job, output_dir, *job) for job in pending]
+            for future in futures:
+                rendered.extend(os.path.basename(path) for path in future.result())
+
+    _write_manifest(manifest_path, manifest)
+    return rendered, skipped
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    from mathematics_roadmap import build_roadmap_layout, create_connections, create_subjects, tracks
+    from roadmap_cache import default_cache, roadmap_key
+    from roadmap_layout import LAYOUTS
+
+    parser = argparse.ArgumentParser(description="Export per-track and per-subject roadmap images.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=FORMATS)
+    parser.add_argument("--layout", default="kamada_kawai", choices=LAYOUTS)
+    parser.add_argument("--radius", type=int, default=2, help="steps around each subject in its focus view")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="re-render even if inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    subjects = create_subjects()
+    connections = create_connections()
+    key = roadmap_key(subjects, connections, tracks, layout=args.layout)
+    G, pos = default_cache().get_or_compute(key, lambda: build_roadmap_layout(subjects, connections, args.layout))
+    rendered, skipped = export_images(args.output_dir, G, pos, tracks, radius=args.radius,
+                                      formats=args.formats, workers=args.workers, force=args.force)
+    print(f"{len(rendered)} images written, {len(skipped)} unchanged, manifest in "
+          f"{os.path.join(args.output_dir, MANIFEST)}")
+
+
+if __name__ == "__main__":
+    main()
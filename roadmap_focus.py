@@ -0,0 +1,57 @@
+from collections import deque
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+from roadmap_layout import layered_layout
+from roadmap_render import render_roadmap
+
+
+def neighborhood(G, center: Hashable, radius: int = 2) -> Dict[Hashable, int]:
+    # Signed hop distance from center: prerequisites negative, successors positive.
+    # Both searches stop at `radius`, so the cost is that of the neighbourhood alone.
+    if center not in G:
+        raise ValueError(f"Unknown subject {center!r}")
+    if radius < 0:
+        raise ValueError("radius must be non-negative")
+    hops = {center: 0}
+    for step, sign in ((G.predecessors, -1), (G.successors, 1)):
+        seen = {center}
+        queue = deque([(center, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if depth == radius:
+                continue
+            for other in step(node):
+                if other not in seen:
+                    seen.add(other)
+                    hops.setdefault(other, sign * (depth + 1))
+                    queue.append((other, depth + 1))
+    return hops
+
+
+def focus_subgraph(G, center: Hashable, radius: int = 2):
+    return G.subgraph(neighborhood(G, center, radius))
+
+
+def focus_layout(H, pos: Optional[Dict[Hashable, np.ndarray]] = None,
+                 tracks: Optional[Dict[str, List[Hashable]]] = None) -> Dict[Hashable, np.ndarray]:
+    # Global coordinates keep the focus view recognisable; without them only the
+    # neighbourhood is laid out, which is cheap at this size
+    if pos is not None and all(node in pos for node in H):
+        return {node: pos[node] for node in H}
+    return layered_layout(H, tracks=tracks)
+
+
+def draw_focus_view(G, center: Hashable, radius: int = 2, pos: Optional[Dict[Hashable, np.ndarray]] = None,
+                    tracks: Optional[Dict[str, List[Hashable]]] = None, figsize=(12, 9), node_size: float = 3000):
+    H = focus_subgraph(G, center, radius)
+    local_pos = focus_layout(H, pos, tracks)
+    name = G.nodes[center].get("name", center)
+    fig = render_roadmap(H, local_pos, figsize=figsize, node_size=node_size,
+                         title=f"{name}: prerequisites and successors within {radius} steps")
+
+    x, y = local_pos[center]
+    fig.axes[0].scatter([x], [y], s=node_size * 1.3, marker="o", facecolors="none",
+                        edgecolors="black", linewidths=3, zorder=2.5)
+    return fig
@@ -0,0 +1,352 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Optional
+
+import networkx as nx
+import numpy as np
+
+LAYOUTS = ["kamada_kawai", "spring", "barnes_hut", "layered"]
+
+
+def _interleave_bits(ix: np.ndarray, iy: np.ndarray, depth: int) -> np.ndarray:
+    code = np.zeros(ix.shape, dtype=np.int64)
+    for b in range(depth):
+        code |= ((ix >> b) & 1) << (2 * b)
+        code |= ((iy >> b) & 1) << (2 * b + 1)
+    return code
+
+
+class _QuadTree:
+    # Linear quadtree built from Morton codes: one sorted pass, then every level is a
+    # run-length split of the code prefixes, so construction is O(N log N) in NumPy.
+    def __init__(self, pos: np.ndarray, depth: int):
+        n = len(pos)
+        lo = pos.min(axis=0)
+        size = float((pos.max(axis=0) - lo).max()) or 1.0
+        cells_per_side = 1 << depth
+        grid = np.minimum(((pos - lo) / size * cells_per_side).astype(np.int64), cells_per_side - 1)
+        codes = _interleave_bits(grid[:, 0], grid[:, 1], depth)
+
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+
+        self.depth = depth
+        self.sizes = [size / (1 << level) for level in range(depth + 1)]
+        self.mass = []
+        self.center = []
+        self.node_cell = []
+        self.child_start = []
+        self.child_count = []
+
+        prefixes = []
+        for level in range(depth + 1):
+            prefix = sorted_codes >> (2 * (depth - level))
+            starts = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+            cell_of_sorted = np.cumsum(np.r_[False, prefix[1:] != prefix[:-1]])
+            cell_of_node = np.empty(n, dtype=np.int64)
+            cell_of_node[order] = cell_of_sorted
+
+            mass = np.bincount(cell_of_node).astype(float)
+            center = np.stack([
+                np.bincount(cell_of_node, weights=pos[:, 0]),
+                np.bincount(cell_of_node, weights=pos[:, 1]),
+            ], axis=1) / mass[:, None]
+
+            prefixes.append(prefix[starts])
+            self.mass.append(mass)
+            self.center.append(center)
+            self.node_cell.append(cell_of_node)
+
+        # Children of a cell are contiguous in the next level because the codes are sorted
+        for level in range(depth):
+            parents = np.searchsorted(prefixes[level], prefixes[level + 1] >> 2)
+            count = np.bincount(parents, minlength=len(prefixes[level]))
+            self.child_count.append(count)
+            self.child_start.append(np.r_[0, np.cumsum(count)[:-1]])
+
+
+def _repulsion(pos: np.ndarray, k: float, theta: float, depth: int,
+               targets: Optional[np.ndarray] = None) -> np.ndarray:
+    n = len(pos)
+    tree = _QuadTree(pos, depth)
+    disp = np.zeros_like(pos)
+
+    # Frontier of (node, cell) pairs still to be resolved, walked level by level
+    pair_node = np.arange(n) if targets is None else np.asarray(targets, dtype=np.int64)
+    pair_cell = np.zeros(len(pair_node), dtype=np.int64)
+    for level in range(depth + 1):
+        if len(pair_node) == 0:
+            break
+        mass = tree.mass[level][pair_cell]
+        center = tree.center[level][pair_cell]
+        own = tree.node_cell[level][pair_node] == pair_cell
+
+        if level == depth:
+            # Deepest cells are treated as point masses, minus the node itself
+            keep = ~own | (mass > 1)
+            pair_node, pair_cell = pair_node[keep], pair_cell[keep]
+            mass, center, own = mass[keep], center[keep], own[keep]
+            own_mass = mass[own]
+            center[own] = (center[own] * own_mass[:, None] - pos[pair_node[own]]) / (own_mass - 1)[:, None]
+            mass[own] -= 1
+            accept = np.ones(len(pair_node), dtype=bool)
+        else:
+            delta = pos[pair_node] - center
+            dist = np.sqrt((delta ** 2).sum(axis=1))
+            accept = ~own & ((mass == 1) | (tree.sizes[level] < theta * dist))
+            drop = own & (mass == 1)
+            expand = ~accept & ~drop
+
+        nodes = pair_node[accept]
+        delta = pos[nodes] - center[accept]
+        dist2 = np.maximum((delta ** 2).sum(axis=1), 1e-12)
+        force = delta * (k * k * mass[accept] / dist2)[:, None]
+        disp[:, 0] += np.bincount(nodes, weights=force[:, 0], minlength=n)
+        disp[:, 1] += np.bincount(nodes, weights=force[:, 1], minlength=n)
+
+        if level == depth:
+            break
+        pair_node, pair_cell = pair_node[expand], pair_cell[expand]
+        counts = tree.child_count[level][pair_cell]
+        starts = tree.child_start[level][pair_cell]
+        pair_node = np.repeat(pair_node, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_cell = np.repeat(starts, counts) + offsets
+
+    return disp
+
+
+def barnes_hut_layout(G, k: Optional[float] = None, iterations: int = 50, theta: float = 0.8,
+                      seed: Optional[int] = 42) -> Dict[Hashable, np.ndarray]:
+    nodes = list(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(2)}
+
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges() if u != v], dtype=np.int64).reshape(-1, 2)
+
+    rng = np.random.default_rng(seed)
+    coords = rng.random((n, 2))
+
+    if k is None:
+        k = 1.0 / np.sqrt(n)
+    depth = int(min(16, max(2, np.ceil(np.log(n) / np.log(4)) + 2)))
+    temperature = 0.1 * float((coords.max(axis=0) - coords.min(axis=0)).max() or 1.0)
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        disp = _repulsion(coords, k, theta, depth)
+
+        # Fruchterman-Reingold attraction along edges, vectorized over the edge list
+        if len(edges):
+            delta = coords[edges[:, 0]] - coords[edges[:, 1]]
+            dist = np.sqrt((delta ** 2).sum(axis=1))
+            pull = delta * (dist / k)[:, None]
+            for dim in range(2):
+                disp[:, dim] -= np.bincount(edges[:, 0], weights=pull[:, dim], minlength=n)
+                disp[:, dim] += np.bincount(edges[:, 1], weights=pull[:, dim], minlength=n)
+
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-12)
+        step = disp * (np.minimum(length, temperature) / length)[:, None]
+        coords += step
+        temperature -= cooling
+
+    return dict(zip(nodes, _rescale(coords)))
+
+
+def incremental_layout(G, pos: Dict[Hashable, np.ndarray], previous_G=None, iterations: int = 20,
+                       theta: float = 0.8, seed: Optional[int] = 42,
+                       changed: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, np.ndarray]:
+    nodes = list(G)
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+
+    # Only new subjects, and endpoints of added or removed connections, may move.
+    # Callers that already know the touched nodes pass them as `changed` instead of previous_G.
+    touched = changed
+    changed = {node for node in nodes if node not in pos}
+    if touched is not None:
+        changed.update(node for node in touched if node in index)
+    elif previous_G is not None:
+        old_edges = set(previous_G.edges())
+        new_edges = set(G.edges())
+        for u, v in old_edges ^ new_edges:
+            changed.update(node for node in (u, v) if node in index)
+    if not changed:
+        return {node: pos[node] for node in nodes}
+
+    placed = [node for node in nodes if node in pos]
+    rng = np.random.default_rng(seed)
+    coords = np.zeros((n, 2))
+    for node in placed:
+        coords[index[node]] = pos[node]
+    if placed:
+        lo = coords[[index[node] for node in placed]].min(axis=0)
+        hi = coords[[index[node] for node in placed]].max(axis=0)
+    else:
+        lo, hi = np.zeros(2), np.ones(2)
+    extent = float((hi - lo).max()) or 1.0
+    k = extent / np.sqrt(n)
+
+    # Seed new nodes at the barycenter of their already placed neighbours
+    for node in nodes:
+        if node in pos:
+            continue
+        anchors = [index[other] for other in nx.all_neighbors(G, node) if other in pos]
+        if anchors:
+            coords[index[node]] = coords[anchors].mean(axis=0) + rng.normal(scale=0.1 * k, size=2)
+        else:
+            coords[index[node]] = lo + rng.random(2) * (hi - lo)
+
+    movable = np.array(sorted(index[node] for node in changed), dtype=np.int64)
+    local_edges = np.array([(index[u], index[v]) for u, v in G.edges()
+                            if u != v and (u in changed or v in changed)], dtype=np.int64).reshape(-1, 2)
+    depth = int(min(16, max(2, np.ceil(np.log(n) / np.log(4)) + 2)))
+    temperature = k
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        disp = _repulsion(coords, k, theta, depth, targets=movable)
+        if len(local_edges):
+            delta = coords[local_edges[:, 0]] - coords[local_edges[:, 1]]
+            dist = np.sqrt((delta ** 2).sum(axis=1))
+            pull = delta * (dist / k)[:, None]
+            for dim in range(2):
+                disp[:, dim] -= np.bincount(local_edges[:, 0], weights=pull[:, dim], minlength=n)
+                disp[:, dim] += np.bincount(local_edges[:, 1], weights=pull[:, dim], minlength=n)
+
+        step = disp[movable]
+        length = np.maximum(np.sqrt((step ** 2).sum(axis=1)), 1e-12)
+        coords[movable] += step * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return dict(zip(nodes, coords))
+
+
+def longest_path_layers(G) -> Dict[Hashable, int]:
+    # Kahn's algorithm: a node's layer is one past its deepest prerequisite
+    indegree = {node: 0 for node in G}
+    for _, v in G.edges():
+        indegree[v] += 1
+    layer = {node: 0 for node in G}
+    queue = deque(node for node in G if indegree[node] == 0)
+    visited = 0
+    while queue:
+        u = queue.popleft()
+        visited += 1
+        for v in G.successors(u):
+            layer[v] = max(layer[v], layer[u] + 1)
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                queue.append(v)
+    if visited != len(indegree):
+        raise ValueError("Layered layout requires an acyclic prerequisite graph")
+    return layer
+
+
+def layered_layout(G, tracks: Optional[Dict[str, List[Hashable]]] = None,
+                   sweeps: int = 4) -> Dict[Hashable, np.ndarray]:
+    if len(G) == 0:
+        return {}
+    layer = longest_path_layers(G)
+
+    lane_of_track = {track: i for i, track in enumerate(tracks or {})}
+    lane = {node: len(lane_of_track) for node in G}
+    for track, members in (tracks or {}).items():
+        for node in members:
+            if node in lane:
+                lane[node] = lane_of_track[track]
+
+    # Long edges are split into chains of dummy nodes so every edge joins adjacent layers
+    up = {node: [] for node in G}
+    down = {node: [] for node in G}
+    for u, v in G.edges():
+        prev = u
+        for depth in range(layer[u] + 1, layer[v]):
+            dummy = ("__dummy__", u, v, depth)
+            layer[dummy] = depth
+            lane[dummy] = lane[u]
+            up[dummy], down[dummy] = [], []
+            down[prev].append(dummy)
+            up[dummy].append(prev)
+            prev = dummy
+        down[prev].append(v)
+        up[v].append(prev)
+
+    layers = [[] for _ in range(max(layer.values()) + 1)]
+    for node in layer:
+        layers[layer[node]].append(node)
+    rank = {}
+    for nodes in layers:
+        nodes.sort(key=lambda node: lane[node])
+        rank.update((node, i) for i, node in enumerate(nodes))
+
+    # Barycenter heuristic, alternating downward and upward sweeps
+    def reorder(nodes, neighbours):
+        def barycenter(node):
+            adjacent = neighbours[node]
+            if not adjacent:
+                return rank[node]
+            return sum(rank[other] for other in adjacent) / len(adjacent)
+        nodes.sort(key=lambda node: (lane[node], barycenter(node)))
+        rank.update((node, i) for i, node in enumerate(nodes))
+
+    for sweep in range(sweeps):
+        if sweep % 2 == 0:
+            for nodes in layers[1:]:
+                reorder(nodes, up)
+        else:
+            for nodes in reversed(layers[:-1]):
+                reorder(nodes, down)
+
+    # Each lane gets a band as wide as its busiest layer; nodes are centred within it
+    lanes = len(lane_of_track) + 1
+    width = [0] * lanes
+    for nodes in layers:
+        counts = [0] * lanes
+        for node in nodes:
+            counts[lane[node]] += 1
+        width = [max(w, c) for w, c in zip(width, counts)]
+    offset = [0.0] * lanes
+    for i in range(1, lanes):
+        offset[i] = offset[i - 1] + width[i - 1] + (1 if width[i - 1] else 0)
+
+    real = list(G)
+    coords = np.zeros((len(real), 2))
+    index = {node: i for i, node in enumerate(real)}
+    for depth, nodes in enumerate(layers):
+        counts = [0] * lanes
+        for node in nodes:
+            counts[lane[node]] += 1
+        seen = [0] * lanes
+        for node in nodes:
+            k = lane[node]
+            if node in index:
+                x = offset[k] + seen[k] + (width[k] - counts[k]) / 2
+                coords[index[node]] = (x, -depth)
+            seen[k] += 1
+
+    return dict(zip(real, _rescale(coords)))
+
+
+def _rescale(coords: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    coords = coords - coords.mean(axis=0)
+    extent = np.abs(coords).max()
+    if extent > 0:
+        coords = coords * (scale / extent)
+    return coords
+
+
+def compute_layout(G, layout: str = "kamada_kawai", seed: int = 42,
+                   tracks: Optional[Dict[str, List[Hashable]]] = None) -> Dict[Hashable, np.ndarray]:
+    if layout == "kamada_kawai":
+        return nx.kamada_kawai_layout(G)
+    if layout == "spring":
+        return nx.spring_layout(G, k=2, iterations=50, seed=seed)
+    if layout == "barnes_hut":
+        return barnes_hut_layout(G, seed=seed)
+    if layout == "layered":
+        return layered_layout(G, tracks)
+    raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}")
@@ -0,0 +1,63 @@
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence
+
+from roadmap_compact import CATEGORIES
+
+PAGE_SIZE = 10
+
+
+class BookListing:
+    # Markdown for each subject's books is rendered once per category filter and reused,
+    # so a rerun only filters ids and emits one block per subject on the visible page.
+    def __init__(self, subjects, tracks: Dict[str, List[Hashable]]):
+        self.subjects = subjects
+        self.tracks = tracks
+        self._blocks: Dict[Hashable, Dict[FrozenSet[str], str]] = {}
+
+    def select(self, track: Optional[str] = None, categories: Sequence[str] = CATEGORIES) -> List[Hashable]:
+        categories = set(categories)
+        ids = self.tracks[track] if track is not None else self.subjects
+        return [subject_id for subject_id in ids
+                if subject_id in self.subjects and
+                any(book.category in categories for book in self.subjects[subject_id].books)]
+
+    def markdown(self, subject_id: Hashable, categories: Sequence[str] = CATEGORIES) -> str:
+        key = frozenset(categories)
+        blocks = self._blocks.setdefault(subject_id, {})
+        block = blocks.get(key)
+        if block is None:
+            block = "\n".join(f"- {book.title} by {book.author}" for book in self.subjects[subject_id].books
+                              if book.category in key)
+            blocks[key] = block
+        return block
+
+    def invalidate(self, subject_ids: Iterable[Hashable]):
+        for subject_id in subject_ids:
+            self._blocks.pop(subject_id, None)
+
+
+def page_count(total: int, page_size: int = PAGE_SIZE) -> int:
+    return max(1, -(-total // page_size))
+
+
+def listing_view(listing: BookListing, page_size: int = PAGE_SIZE):
+    import streamlit as st
+
+    columns = st.columns(3)
+    track = columns[0].selectbox("Track", [None] + list(listing.tracks),
+                                 format_func=lambda name: "All tracks" if name is None else name)
+    categories = columns[1].multiselect("Categories", CATEGORIES, default=CATEGORIES)
+    collapsed = columns[2].toggle("Collapse subjects", value=False)
+
+    ids = listing.select(track, categories)
+    pages = page_count(len(ids), page_size)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    st.caption(f"{len(ids)} subjects")
+
+    for subject_id in ids[(page - 1) * page_size:page * page_size]:
+        name = listing.subjects[subject_id].name
+        if collapsed:
+            # Folded subjects keep a long page short; only the visible page is sent either way
+            with st.expander(name):
+                st.markdown(listing.markdown(subject_id, categories))
+        else:
+            st.markdown(f"#### {name}\n{listing.markdown(subject_id, categories)}")
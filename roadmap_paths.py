@@ -0,0 +1,162 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from roadmap_reachability import topological_order
+
+# All-pairs rows store a target position, a float32 cost and an int32 parent per reachable pair.
+# Costs are float32 only there: single-source results and every returned cost stay float64.
+PAIR_BYTES = 12
+MAX_TABLE_BYTES = 256 * 1024 * 1024
+SAMPLE_SOURCES = 64
+
+
+def book_count_weights(G) -> Dict[Hashable, float]:
+    return {node: float(len(attr.get("books", []))) for node, attr in G.nodes(data=True)}
+
+
+class PathEngine:
+    # Cheapest learning routes on the prerequisite DAG. A route's cost is the sum of the
+    # node weights of every subject on it plus the weights of the edges it follows.
+    # Single-source runs relax edges once in topological order, O(V + E) per source;
+    # results are kept per source in an LRU, or for every source after precompute().
+    def __init__(self, G, node_weight: Optional[Dict[Hashable, float]] = None,
+                 edge_weight: Optional[Dict[Tuple[Hashable, Hashable], float]] = None, max_sources: int = 256):
+        self.nodes = topological_order(G)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        node_weight = book_count_weights(G) if node_weight is None else node_weight
+        self.node_weight = np.array([node_weight.get(node, 0.0) for node in self.nodes], dtype=np.float64)
+        if (self.node_weight < 0).any():
+            raise ValueError("Node weights must be non-negative")
+
+        # Successor lists in topological positions, with the cost of stepping onto the target
+        self._succ: List[List[Tuple[int, float]]] = [[] for _ in self.nodes]
+        for u, v in G.edges():
+            cost = (edge_weight or {}).get((u, v), 0.0)
+            if cost < 0:
+                raise ValueError(f"Edge weight of {u} -> {v} must be non-negative")
+            self._succ[self.index[u]].append((self.index[v], cost + self.node_weight[self.index[v]]))
+
+        self.max_sources = max_sources
+        self._lru: "OrderedDict[int, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # CSR all-pairs table: row s spans offsets[s]:offsets[s + 1] of the sorted targets
+        # reachable from s, with their costs and route parents
+        self._table: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _single_source(self, s: int) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(self.nodes)
+        dist = np.full(n, np.inf)
+        parent = np.full(n, -1, dtype=np.int32)
+        dist[s] = self.node_weight[s]
+        values = dist.tolist()
+        parents = parent.tolist()
+        succ = self._succ
+        # Nothing before the source in topological order can be reached from it
+        for u in range(s, n):
+            base = values[u]
+            if base == float("inf"):
+                continue
+            for v, cost in succ[u]:
+                if base + cost < values[v]:
+                    values[v] = base + cost
+                    parents[v] = u
+        return np.array(values, dtype=np.float64), np.array(parents, dtype=np.int32)
+
+    def _row(self, s: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        dist, parent = self._single_source(s)
+        reached = np.flatnonzero(np.isfinite(dist)).astype(np.int32)
+        return reached, dist[reached].astype(np.float32), parent[reached]
+
+    def _from(self, s: int) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            result = self._lru.get(s)
+            if result is not None:
+                self._lru.move_to_end(s)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = self._single_source(s)
+        with self._lock:
+            self._lru[s] = result
+            while len(self._lru) > self.max_sources:
+                self._lru.popitem(last=False)
+        return result
+
+    def precompute(self, max_bytes: int = MAX_TABLE_BYTES) -> bool:
+        # Stores only reachable pairs, PAIR_BYTES each, with costs rounded to float32 to keep
+        # the table compact. Gives up once the table would exceed max_bytes and returns False;
+        # queries then keep using the per-source LRU, which keeps exact float64 costs.
+        n = len(self.nodes)
+        limit = max_bytes // PAIR_BYTES
+        sampled = {}
+        if n > SAMPLE_SOURCES:
+            # Size the table from a random sample of sources first, so an oversized roadmap
+            # is refused after SAMPLE_SOURCES sweeps rather than most of n
+            sample = np.random.default_rng(0).choice(n, SAMPLE_SOURCES, replace=False)
+            sampled = {int(s): self._row(int(s)) for s in sample}
+            if sum(len(row[0]) for row in sampled.values()) * n / SAMPLE_SOURCES > limit:
+                return False
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        rows = []
+        pairs = 0
+        for s in range(n):
+            row = sampled.pop(s, None) or self._row(s)
+            pairs += len(row[0])
+            if pairs > limit:
+                return False
+            rows.append(row)
+            offsets[s + 1] = pairs
+        if rows:
+            targets, costs, parents = (np.concatenate(column) for column in zip(*rows))
+        else:
+            targets, costs, parents = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32),
+                                       np.zeros(0, dtype=np.int32))
+        self._table = (offsets, targets, costs, parents)
+        return True
+
+    def _pair(self, s: int, t: int) -> Tuple[float, int]:
+        # Cost of the cheapest route s -> t and the subject before t on it (inf, -1 if none)
+        if self._table is None:
+            dist, parent = self._from(s)
+            return float(dist[t]), int(parent[t])
+        offsets, targets, costs, parents = self._table
+        start, end = offsets[s], offsets[s + 1]
+        i = start + int(np.searchsorted(targets[start:end], t))
+        if i < end and targets[i] == t:
+            return float(costs[i]), int(parents[i])
+        return float("inf"), -1
+
+    def distances(self, source: Hashable) -> Dict[Hashable, float]:
+        s = self.index[source]
+        if self._table is not None:
+            offsets, targets, costs, _ = self._table
+            row = slice(offsets[s], offsets[s + 1])
+            return {self.nodes[i]: float(c) for i, c in zip(targets[row].tolist(), costs[row].tolist())}
+        dist, _ = self._from(s)
+        return {self.nodes[i]: float(dist[i]) for i in np.flatnonzero(np.isfinite(dist))}
+
+    def cost(self, source: Hashable, target: Hashable) -> float:
+        return self._pair(self.index[source], self.index[target])[0]
+
+    def shortest_path(self, source: Hashable, target: Hashable) -> Tuple[float, List[Hashable]]:
+        s, t = self.index[source], self.index[target]
+        if self._table is None:
+            dist, parents = self._from(s)
+            cost, parent = float(dist[t]), int(parents[t])
+            step = lambda node: int(parents[node])
+        else:
+            cost, parent = self._pair(s, t)
+            step = lambda node: self._pair(s, node)[1]
+        if cost == float("inf"):
+            raise ValueError(f"No learning path from {source} to {target}")
+        path = [t]
+        while parent != -1:
+            path.append(parent)
+            parent = step(parent)
+        return cost, [self.nodes[i] for i in reversed(path)]
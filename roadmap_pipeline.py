@@ -0,0 +1,210 @@
+import hashlib
+import time
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from roadmap_listing import BookListing
+from roadmap_search import SearchIndex
+from roadmap_validate import RoadmapValidator
+
+STAGES = ["parse", "graph", "validate", "layout", "render", "index"]
+
+
+def subject_hash(subject) -> str:
+    record = (subject.name, subject.category, [(book.title, book.author, book.category) for book in subject.books])
+    return hashlib.sha1(repr(record).encode("utf-8")).hexdigest()
+
+
+class RoadmapPipeline:
+    # Keeps every derived artifact (graph, validation issues, layout, tiles, listing, search
+    # index) for one roadmap and updates them from a diff of subject record hashes and
+    # connection multisets. Each stage only sees the subjects and edges the diff names;
+    # `report` holds how many items and seconds each stage spent on the last update.
+    def __init__(self, subjects, connections: Iterable[Tuple[Hashable, Hashable]], colors: Dict[str, str],
+                 tracks: Optional[Dict[str, List[Hashable]]] = None, layout: str = "barnes_hut",
+                 pos: Optional[Dict[Hashable, np.ndarray]] = None):
+        from mathematics_roadmap import create_math_roadmap
+        from roadmap_layout import compute_layout
+
+        self.tracks = tracks or {}
+        self.subjects = dict(subjects)
+        self.connections = Counter(connections)
+        self.hashes = {subject_id: subject_hash(subject) for subject_id, subject in self.subjects.items()}
+        self.G = create_math_roadmap(self.subjects, list(self.connections))
+        self.validator = RoadmapValidator(self.subjects, self.connections.elements(), colors)
+        self.pos = dict(pos) if pos is not None else compute_layout(self.G, layout, tracks=self.tracks)
+        self.listing = BookListing(self.subjects, self.tracks)
+        self.index = SearchIndex.from_subjects(self.subjects)
+        self.tiles = None
+        self._figure = None
+        self.report: Dict[str, Tuple[int, float]] = {}
+
+    def issues(self):
+        return self.validator.issues()
+
+    def tile_renderer(self):
+        from roadmap_tiles import TileRenderer
+
+        if self.tiles is None:
+            self.tiles = TileRenderer(self.G, self.pos)
+        return self.tiles
+
+    def figure(self):
+        # The full chart is one batched draw; it is redone only when something changed
+        from roadmap_render import render_roadmap
+
+        if self._figure is None:
+            self._figure = render_roadmap(self.G, self.pos)
+        return self._figure
+
+    def write_drawio(self, target):
+        # Cheap enough to rerun after every update; unchanged subjects give identical lines
+        from roadmap_drawio import write_drawio
+
+        write_drawio(target, self.G, self.pos, subjects=self.subjects)
+
+    def update(self, subjects, connections: Iterable[Tuple[Hashable, Hashable]]) -> Dict[str, Tuple[int, float]]:
+        # parse: hash each record and compare with the previous hashes
+        started = time.perf_counter()
+        changed = {}
+        hashes = {}
+        for subject_id, subject in subjects.items():
+            digest = subject_hash(subject)
+            hashes[subject_id] = digest
+            if self.hashes.get(subject_id) != digest:
+                changed[subject_id] = subject
+        for subject_id in self.hashes:
+            if subject_id not in hashes:
+                changed[subject_id] = None
+        new_connections = Counter(connections)
+        added = list((new_connections - self.connections).elements())
+        removed = list((self.connections - new_connections).elements())
+        parse = (len(changed) + len(added) + len(removed), time.perf_counter() - started)
+
+        report = self.apply(changed, added, removed)
+        report["parse"] = parse
+        self.report = {stage: report[stage] for stage in STAGES}
+        return self.report
+
+    def apply(self, changed: Dict[Hashable, Optional[object]], added: Iterable[Tuple[Hashable, Hashable]] = (),
+              removed: Iterable[Tuple[Hashable, Hashable]] = ()) -> Dict[str, Tuple[int, float]]:
+        # changed maps subject ids to their new Subject, or None for a removed subject.
+        # Callers that already know their edit can call this directly and skip the diff.
+        added, removed = list(added), list(removed)
+        report = {"parse": (0, 0.0)}
+        # Only a subject's name and category are drawn; book edits leave the images alone
+        relabelled = [subject_id for subject_id, subject in changed.items()
+                      if subject is None or subject_id not in self.subjects or
+                      (subject.name, subject.category) != (self.subjects[subject_id].name,
+                                                           self.subjects[subject_id].category)]
+        old_pos = {node: self.pos[node] for node in relabelled if node in self.pos}
+        for u, v in added + removed:
+            for node in (u, v):
+                if node in self.pos:
+                    old_pos.setdefault(node, self.pos[node])
+
+        started = time.perf_counter()
+        touched = self._update_graph(changed, added, removed)
+        report["graph"] = (len(changed) + len(added) + len(removed), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for subject_id, subject in changed.items():
+            if subject is None:
+                if subject_id in self.validator.subjects:
+                    self.validator.remove_subject(subject_id)
+            else:
+                self.validator.set_subject(subject_id, subject)
+        for u, v in removed:
+            self.validator.remove_connection(u, v)
+        for u, v in added:
+            self.validator.add_connection(u, v)
+        report["validate"] = (len(changed) + len(added) + len(removed), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for node in list(self.pos):
+            if node not in self.G:
+                del self.pos[node]
+        moved = [node for node in touched if node in self.G]
+        if moved:
+            from roadmap_layout import incremental_layout
+
+            self.pos = incremental_layout(self.G, self.pos, changed=moved)
+        report["layout"] = (len(moved), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        self.listing.invalidate(changed)
+        dirty = self._dirty_bounds(old_pos, relabelled, moved)
+        rekeyed = 0
+        if dirty is not None:
+            self._figure = None
+            if self.tiles is not None:
+                rekeyed = self.tiles.update(self.G, self.pos, dirty)
+        report["render"] = (rekeyed, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for subject_id, subject in changed.items():
+            if subject is None:
+                self.index.remove_subject(subject_id)
+            else:
+                self.index.add_subject(subject_id, subject)
+        report["index"] = (len(changed), time.perf_counter() - started)
+
+        self.report = report
+        return report
+
+    def _update_graph(self, changed, added, removed) -> List[Hashable]:
+        # Returns nodes whose position has to be (re)computed: new nodes and edge endpoints
+        G = self.G
+        touched = []
+        for subject_id, subject in changed.items():
+            if subject is None:
+                self.subjects.pop(subject_id, None)
+                self.hashes.pop(subject_id, None)
+                if subject_id in G:
+                    if G.degree(subject_id):
+                        # Still named by connections: keep it as a bare node, like undefined ids
+                        G.nodes[subject_id].clear()
+                    else:
+                        G.remove_node(subject_id)
+                continue
+            if subject_id not in G:
+                touched.append(subject_id)
+            self.subjects[subject_id] = subject
+            self.hashes[subject_id] = subject_hash(subject)
+            G.add_node(subject_id, name=subject.name, category=subject.category,
+                       books=[f"{b.title} by {b.author}" for b in subject.books])
+
+        for u, v in removed:
+            self.connections[(u, v)] -= 1
+            if self.connections[(u, v)] <= 0:
+                del self.connections[(u, v)]
+                G.remove_edge(u, v)
+                touched.extend((u, v))
+                for node in (u, v):
+                    if node not in self.subjects and node in G and not G.degree(node):
+                        G.remove_node(node)
+        for u, v in added:
+            self.connections[(u, v)] += 1
+            if not G.has_edge(u, v):
+                G.add_edge(u, v)
+                touched.extend((u, v))
+        return list(dict.fromkeys(touched))
+
+    def _dirty_bounds(self, old_pos: Dict[Hashable, np.ndarray], relabelled: List[Hashable],
+                      moved: List[Hashable]) -> Optional[Tuple[float, float, float, float]]:
+        # Box around the old and new position of every affected node, plus the neighbours of
+        # moved nodes, which covers every edge segment that could have moved or appeared
+        points = list(old_pos.values())
+        points.extend(self.pos[node] for node in relabelled if node in self.pos)
+        for node in moved:
+            if node in self.G:
+                points.append(self.pos[node])
+                points.extend(self.pos[other] for other in self.G.predecessors(node))
+                points.extend(self.pos[other] for other in self.G.successors(node))
+        if not points:
+            return None
+        xy = np.asarray(points, dtype=float).reshape(-1, 2)
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        return float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# MATH_ROADMAP_PROFILE=1 turns timing on for every run, =alloc also traces allocations;
+# MATH_ROADMAP_PROFILE_OUT names a file (.json, anything else gets OpenMetrics text)
+# that is rewritten after each profiled run.
+PROFILE_ENV = os.environ.get("MATH_ROADMAP_PROFILE", "")
+PROFILE_OUT = os.environ.get("MATH_ROADMAP_PROFILE_OUT")
+
+
+# tracemalloc is process-wide while profilers are per session thread: tracing is started
+# by the first profiler that needs it and stopped when the last one finishes, unless
+# something else had already started it
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+class _NullStage:
+    # Shared do-nothing context manager handed out while profiling is off
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "allocated", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "started", "memory", "cache")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.cache = profiler._cache_counts()
+        self.memory = tracemalloc.get_traced_memory()[0] if profiler.allocations else 0
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        profiler = self.profiler
+        stats = profiler.stages.get(self.name)
+        if stats is None:
+            stats = profiler.stages[self.name] = StageStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        if profiler.allocations and tracemalloc.is_tracing():
+            # Net bytes still allocated when the stage ends, nested stages included. Tracing
+            # is process-wide, so concurrent sessions' allocations are counted too.
+            stats.allocated += tracemalloc.get_traced_memory()[0] - self.memory
+        hits, misses = profiler._cache_counts()
+        stats.cache_hits += hits - self.cache[0]
+        stats.cache_misses += misses - self.cache[1]
+        return False
+
+
+class Profiler:
+    # Per-stage wall time, net allocations and cache hit/miss deltas. Stages nest; each
+    # reports its own inclusive totals. A disabled profiler hands out one shared no-op
+    # context manager, so instrumented code pays a function call per stage and nothing more.
+    def __init__(self, enabled: bool = False, allocations: bool = False):
+        self.enabled = enabled
+        self.allocations = enabled and allocations
+        self.stages: "OrderedDict[str, StageStats]" = OrderedDict()
+        self.caches = []
+        self._tracing = False
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def watch_cache(self, cache):
+        # Anything with hits/misses counters, e.g. a RoadmapCache
+        if self.enabled and cache not in self.caches:
+            self.caches.append(cache)
+
+    def _cache_counts(self):
+        return sum(cache.hits for cache in self.caches), sum(cache.misses for cache in self.caches)
+
+    def start(self):
+        if self.allocations and not self._tracing:
+            _acquire_tracing()
+            self._tracing = True
+
+    def stop(self):
+        if self._tracing:
+            _release_tracing()
+            self._tracing = False
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.as_dict() for name, stats in self.stages.items()}
+
+    def to_json(self) -> str:
+        return json.dumps({"stages": self.to_dict()}, indent=2)
+
+    def to_openmetrics(self) -> str:
+        lines = []
+        metrics = [("seconds", "counter", "Wall time spent in the stage"),
+                   ("calls", "counter", "Number of times the stage ran"),
+                   ("allocated", "gauge", "Net bytes allocated by the stage"),
+                   ("cache_hits", "counter", "Roadmap cache hits during the stage"),
+                   ("cache_misses", "counter", "Roadmap cache misses during the stage")]
+        for field, kind, help_text in metrics:
+            name = f"roadmap_stage_{field}"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"# HELP {name} {help_text}.")
+            suffix = "_total" if kind == "counter" else ""
+            for stage, stats in self.stages.items():
+                lines.append(f'{name}{suffix}{{stage="{stage}"}} {getattr(stats, field)}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        text = self.to_json() if path.endswith(".json") else self.to_openmetrics()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def summary_markdown(self) -> str:
+        lines = ["| stage | calls | ms | alloc KiB | cache hit/miss |", "|---|---:|---:|---:|---:|"]
+        for name, stats in self.stages.items():
+            lines.append(f"| {name} | {stats.calls} | {stats.seconds * 1000:.1f} | "
+                         f"{stats.allocated / 1024:.0f} | {stats.cache_hits}/{stats.cache_misses} |")
+        return "\n".join(lines)
+
+
+_DISABLED = Profiler()
+_local = threading.local()
+
+
+def current() -> Profiler:
+    # Each Streamlit session runs its script in its own thread, so each gets its own profiler
+    return getattr(_local, "profiler", _DISABLED)
+
+
+def stage(name: str):
+    return current().stage(name)
+
+
+class activate:
+    def __init__(self, profiler: Profiler):
+        self.profiler = profiler
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = current()
+        _local.profiler = self.profiler
+        self.profiler.start()
+        return self.profiler
+
+    def __exit__(self, *exc):
+        self.profiler.stop()
+        _local.profiler = self.previous
+        return False
+
+
+def from_environment(enabled: Optional[bool] = None) -> Profiler:
+    enabled = bool(PROFILE_ENV) if enabled is None else enabled
+    return Profiler(enabled=enabled, allocations=PROFILE_ENV == "alloc")
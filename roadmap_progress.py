@@ -0,0 +1,113 @@
+import threading
+from typing import Dict, Hashable, Iterable, Optional, Set
+
+import numpy as np
+
+from roadmap_reachability import ReachabilityIndex
+
+COMPLETED_BORDER = "#2e7d32"
+UNLOCKED_BORDER = "#ef6c00"
+LOCKED_SHADE = (1.0, 1.0, 1.0, 0.65)
+
+
+class ProgressGraph:
+    # Built once and never mutated after __init__, so any number of sessions can query it
+    # concurrently. A learner's progress is a plain int: bit i set = i-th subject in
+    # topological order completed. Every query is a few bitset operations against the shared masks.
+    def __init__(self, G):
+        self.reach = ReachabilityIndex(G)
+        self.nodes = self.reach.nodes
+        index = self.reach.index
+        edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+        self._sources, self._targets = edges[:, 0], edges[:, 1]
+        self._bytes = (len(self.nodes) + 7) // 8
+        self.full_mask = (1 << len(self.nodes)) - 1
+
+    def mask(self, completed: Iterable[Hashable]) -> int:
+        return self.reach.encode(completed)
+
+    def completed(self, progress: int) -> Set[Hashable]:
+        return self.reach.decode(progress)
+
+    def _bits(self, progress: int) -> np.ndarray:
+        data = np.frombuffer((progress & self.full_mask).to_bytes(self._bytes, "little"), dtype=np.uint8)
+        return np.unpackbits(data, count=len(self.nodes), bitorder="little").astype(bool)
+
+    def unlocked_mask(self, progress: int) -> int:
+        # A subject is unlocked when it is not completed and no edge into it starts at an
+        # uncompleted subject; one vectorised pass over the edge arrays
+        done = self._bits(progress)
+        blocked = np.zeros(len(self.nodes), dtype=bool)
+        blocked[self._targets[~done[self._sources]]] = True
+        ready = np.packbits(~done & ~blocked, bitorder="little")
+        return int.from_bytes(ready.tobytes(), "little")
+
+    def unlocked(self, progress: int) -> Set[Hashable]:
+        return self.reach.decode(self.unlocked_mask(progress))
+
+    def remaining_prerequisites(self, progress: int, target: Hashable) -> Set[Hashable]:
+        return self.reach.decode(self.reach.ancestors_mask(target) & ~progress)
+
+    def is_ready(self, progress: int, target: Hashable) -> bool:
+        return self.reach.ancestors_mask(target) & ~progress == 0
+
+    def fraction_complete(self, progress: int) -> float:
+        return bin(progress & self.full_mask).count("1") / len(self.nodes) if self.nodes else 0.0
+
+
+class ProgressStore:
+    # Per-learner bitsets next to one shared ProgressGraph; updates are serialised,
+    # reads see whichever int was stored last (ints are immutable, so no torn reads).
+    def __init__(self, graph: ProgressGraph):
+        self.graph = graph
+        self._progress: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, learner: Hashable) -> int:
+        return self._progress.get(learner, 0)
+
+    def set(self, learner: Hashable, completed: Iterable[Hashable]) -> int:
+        progress = self.graph.mask(completed)
+        with self._lock:
+            self._progress[learner] = progress
+        return progress
+
+    def mark(self, learner: Hashable, subjects: Iterable[Hashable], completed: bool = True) -> int:
+        change = self.graph.mask(subjects)
+        with self._lock:
+            progress = self._progress.get(learner, 0)
+            progress = progress | change if completed else progress & ~change
+            self._progress[learner] = progress
+        return progress
+
+    def forget(self, learner: Hashable):
+        with self._lock:
+            self._progress.pop(learner, None)
+
+    def unlocked(self, learner: Hashable) -> Set[Hashable]:
+        return self.graph.unlocked(self.get(learner))
+
+    def remaining_prerequisites(self, learner: Hashable, target: Hashable) -> Set[Hashable]:
+        return self.graph.remaining_prerequisites(self.get(learner), target)
+
+
+def draw_progress(G, pos: Dict[Hashable, np.ndarray], graph: ProgressGraph, progress: int,
+                  node_size: float = 3000, title: Optional[str] = "Your Mathematics Roadmap"):
+    from roadmap_render import render_roadmap
+
+    # The shared roadmap drawing, with completed and unlocked subjects outlined and the rest faded
+    fig = render_roadmap(G, pos, node_size=node_size, title=title)
+    ax = fig.axes[0]
+    xy = np.array([pos[node] for node in graph.nodes], dtype=float).reshape(-1, 2)
+    done = graph._bits(progress)
+    unlocked = graph._bits(graph.unlocked_mask(progress))
+
+    for group, border in ((done, COMPLETED_BORDER), (unlocked, UNLOCKED_BORDER)):
+        if group.any():
+            ax.scatter(xy[group, 0], xy[group, 1], s=node_size * 1.2, marker="o", facecolors="none",
+                       edgecolors=border, linewidths=4, zorder=2.5)
+    locked = ~done & ~unlocked
+    if locked.any():
+        ax.scatter(xy[locked, 0], xy[locked, 1], s=node_size, marker="o", c=[LOCKED_SHADE],
+                   edgecolors="none", zorder=3.5)
+    return fig
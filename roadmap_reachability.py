@@ -0,0 +1,99 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+def topological_order(G) -> List[Hashable]:
+    indegree = {node: 0 for node in G}
+    for _, v in G.edges():
+        indegree[v] += 1
+    queue = deque(node for node in G if indegree[node] == 0)
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in G.successors(u):
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                queue.append(v)
+    if len(order) != len(indegree):
+        raise ValueError("Reachability index requires an acyclic prerequisite graph")
+    return order
+
+
+class ReachabilityIndex:
+    # Transitive closure stored as one integer bitset per subject. Bit i stands for the
+    # i-th subject in topological order, so set operations run word-at-a-time in C.
+    def __init__(self, G):
+        self.nodes = topological_order(G)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self._ancestors = [0] * len(self.nodes)
+        self._descendants = [0] * len(self.nodes)
+
+        for i, node in enumerate(self.nodes):
+            mask = 0
+            for pred in G.predecessors(node):
+                p = self.index[pred]
+                mask |= self._ancestors[p] | (1 << p)
+            self._ancestors[i] = mask
+
+        for i in range(len(self.nodes) - 1, -1, -1):
+            mask = 0
+            for succ in G.successors(self.nodes[i]):
+                s = self.index[succ]
+                mask |= self._descendants[s] | (1 << s)
+            self._descendants[i] = mask
+
+    def encode(self, nodes: Iterable[Hashable]) -> int:
+        mask = 0
+        for node in nodes:
+            mask |= 1 << self.index[node]
+        return mask
+
+    def decode(self, mask: int) -> Set[Hashable]:
+        result = set()
+        while mask:
+            low = mask & -mask
+            result.add(self.nodes[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def ancestors_mask(self, node: Hashable) -> int:
+        return self._ancestors[self.index[node]]
+
+    def descendants_mask(self, node: Hashable) -> int:
+        return self._descendants[self.index[node]]
+
+    def ancestors(self, node: Hashable) -> Set[Hashable]:
+        return self.decode(self._ancestors[self.index[node]])
+
+    def descendants(self, node: Hashable) -> Set[Hashable]:
+        return self.decode(self._descendants[self.index[node]])
+
+    def count_ancestors(self, node: Hashable) -> int:
+        return bin(self._ancestors[self.index[node]]).count("1")
+
+    def is_prerequisite(self, before: Hashable, after: Hashable) -> bool:
+        return bool((self._ancestors[self.index[after]] >> self.index[before]) & 1)
+
+    def batch_is_prerequisite(self, pairs: Iterable[Tuple[Hashable, Hashable]]) -> List[bool]:
+        index, ancestors = self.index, self._ancestors
+        return [bool((ancestors[index[after]] >> index[before]) & 1) for before, after in pairs]
+
+    def batch_ancestors(self, nodes: Iterable[Hashable]) -> Dict[Hashable, Set[Hashable]]:
+        return {node: self.ancestors(node) for node in nodes}
+
+    def batch_descendants(self, nodes: Iterable[Hashable]) -> Dict[Hashable, Set[Hashable]]:
+        return {node: self.descendants(node) for node in nodes}
+
+    def union_ancestors(self, nodes: Iterable[Hashable]) -> Set[Hashable]:
+        # Everything needed before studying all of the given subjects
+        mask = 0
+        for node in nodes:
+            mask |= self._ancestors[self.index[node]]
+        return self.decode(mask)
+
+    def common_ancestors(self, nodes: Iterable[Hashable]) -> Set[Hashable]:
+        mask = -1
+        for node in nodes:
+            mask &= self._ancestors[self.index[node]]
+        return self.decode(mask) if mask != -1 else set()
@@ -0,0 +1,97 @@
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from mathematics_roadmap import BORDERS, COLORS
+from roadmap_profile import stage
+
+CATEGORY_ORDER = ["essential", "recommended", "optional"]
+CATEGORY_CODES = {category: i for i, category in enumerate(CATEGORY_ORDER)}
+UNKNOWN_FILL = "#ffffff"
+UNKNOWN_BORDER = "#999999"
+
+
+def roadmap_arrays(G, pos: Dict[Hashable, np.ndarray]) -> Tuple[List[Hashable], np.ndarray, np.ndarray, np.ndarray]:
+    # Node order, (N, 2) coordinates, category codes (-1 = unknown) and (E, 2) edge indices
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    xy = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
+    codes = np.array([CATEGORY_CODES.get(attr.get("category"), -1) for _, attr in G.nodes(data=True)],
+                     dtype=np.int64)
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    return nodes, xy, codes, edges
+
+
+def category_palette(colors: Dict[str, str], unknown: str) -> np.ndarray:
+    from matplotlib.colors import to_rgba_array
+
+    # Unknown categories use code -1, which indexes the last row
+    return to_rgba_array([colors[category] for category in CATEGORY_ORDER] + [unknown])
+
+
+def draw_arrowheads(ax, xy: np.ndarray, edges: np.ndarray, node_radius: float, length: float, half_width: float):
+    from matplotlib.collections import PolyCollection
+    from matplotlib.transforms import Affine2D
+
+    # Heads are sized in points and anchored at the target node, so they follow the data
+    # but keep a constant size; directions are taken in display space to match the axes aspect.
+    display = ax.transData.transform(xy)
+    direction = display[edges[:, 1]] - display[edges[:, 0]]
+    norm = np.sqrt((direction ** 2).sum(axis=1))
+    keep = norm > 0
+    direction = direction[keep] / norm[keep, None]
+    normal = np.stack([-direction[:, 1], direction[:, 0]], axis=1)
+
+    tip = -direction * node_radius
+    base = tip - direction * length
+    verts = np.stack([tip, base + normal * half_width, base - normal * half_width], axis=1)
+    heads = PolyCollection(verts, offsets=xy[edges[keep, 1]], offset_transform=ax.transData,
+                           facecolors="gray", edgecolors="gray", zorder=1.5)
+    heads.set_transform(Affine2D().scale(1 / 72.0) + ax.figure.dpi_scale_trans)
+    ax.add_collection(heads, autolim=False)
+    return heads
+
+
+def render_roadmap(G, pos: Dict[Hashable, np.ndarray], ax=None, figsize=(24, 18), node_size: float = 3000,
+                   font_size: float = 8, arrowsize: float = 20, edge_width: float = 1.5, labels: bool = True,
+                   title: str = "Mathematics Learning Roadmap"):
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    nodes, xy, codes, edges = roadmap_arrays(G, pos)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize)
+        own_figure = True
+    else:
+        fig = ax.figure
+        own_figure = False
+
+    # One LineCollection for every edge, one PathCollection for every node
+    if len(edges):
+        ax.add_collection(LineCollection(xy[edges], colors="gray", linewidths=edge_width, zorder=1))
+    ax.scatter(xy[:, 0], xy[:, 1], s=node_size, marker="o",
+               c=category_palette(COLORS, UNKNOWN_FILL)[codes],
+               edgecolors=category_palette(BORDERS, UNKNOWN_BORDER)[codes],
+               zorder=2)
+
+    if labels:
+        for node, (x, y) in zip(nodes, xy):
+            ax.text(x, y, G.nodes[node].get("name", node), fontsize=font_size,
+                    ha="center", va="center", zorder=3, clip_on=True)
+
+    if len(xy):
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        pad = np.where(hi > lo, (hi - lo) * 0.1, 0.1)
+        ax.set_xlim(lo[0] - pad[0], hi[0] + pad[0])
+        ax.set_ylim(lo[1] - pad[1], hi[1] + pad[1])
+    if title:
+        ax.set_title(title, fontsize=16, pad=20)
+    ax.axis("off")
+    if own_figure:
+        with stage("tight_layout"):
+            fig.tight_layout()
+
+    if len(edges):
+        # networkx's "-|>" head: 0.4 x 0.2 of the arrow size
+        draw_arrowheads(ax, xy, edges, np.sqrt(node_size) / 2, 0.4 * arrowsize, 0.2 * arrowsize)
+    return fig
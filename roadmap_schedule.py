@@ -0,0 +1,107 @@
+import heapq
+from collections import deque
+from math import ceil
+from typing import Dict, Hashable, List, Optional
+
+from roadmap_reachability import topological_order
+
+
+class StudyPlan:
+    def __init__(self, semesters: List[List[Hashable]], start: Dict[Hashable, int],
+                 critical_path: List[Hashable], slack: Dict[Hashable, int], length: int):
+        self.semesters = semesters
+        self.start = start
+        self.critical_path = critical_path
+        self.slack = slack
+        self.length = length
+
+
+def subject_effort(G, books_per_semester: int = 3) -> Dict[Hashable, int]:
+    # One semester per few books; start nodes without books take no time
+    return {node: ceil(len(attr.get("books", [])) / books_per_semester) for node, attr in G.nodes(data=True)}
+
+
+def prerequisite_subgraph(G, target: Hashable):
+    seen = {target}
+    queue = deque([target])
+    while queue:
+        node = queue.popleft()
+        for pred in G.predecessors(node):
+            if pred not in seen:
+                seen.add(pred)
+                queue.append(pred)
+    return G.subgraph(seen)
+
+
+def critical_path_analysis(G, effort: Dict[Hashable, int], order: Optional[List[Hashable]] = None):
+    # Classic CPM over node durations, ignoring the concurrency cap
+    if order is None:
+        order = topological_order(G)
+    earliest = {}
+    for node in order:
+        earliest[node] = max((earliest[p] + effort[p] for p in G.predecessors(node)), default=0)
+    length = max((earliest[node] + effort[node] for node in order), default=0)
+
+    latest = {}
+    for node in reversed(order):
+        finish = min((latest[s] for s in G.successors(node)), default=length)
+        latest[node] = finish - effort[node]
+    slack = {node: latest[node] - earliest[node] for node in order}
+
+    path = []
+    candidates = [node for node in order if slack[node] == 0 and earliest[node] == 0 and not G.in_degree(node)]
+    node = max(candidates, key=lambda n: effort[n], default=None)
+    while node is not None:
+        path.append(node)
+        finish = earliest[node] + effort[node]
+        node = next((succ for succ in G.successors(node)
+                     if slack[succ] == 0 and earliest[succ] == finish), None)
+    return path, slack, length
+
+
+def schedule_study_plan(G, effort: Optional[Dict[Hashable, int]] = None, max_concurrent: int = 3,
+                        target: Optional[Hashable] = None) -> StudyPlan:
+    if max_concurrent < 1:
+        raise ValueError("max_concurrent must be at least 1")
+    if target is not None:
+        G = prerequisite_subgraph(G, target)
+    if effort is None:
+        effort = subject_effort(G)
+
+    order = topological_order(G)
+    critical_path, slack, length = critical_path_analysis(G, effort, order)
+    position = {node: i for i, node in enumerate(order)}
+
+    # List scheduling: each semester fills free slots with ready subjects, least slack first
+    waiting = {node: G.in_degree(node) for node in order}
+    ready = [(slack[node], position[node], node) for node in order if waiting[node] == 0]
+    heapq.heapify(ready)
+    running = []
+    start = {}
+    semesters = []
+    semester = 0
+
+    def release(node):
+        for succ in G.successors(node):
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                heapq.heappush(ready, (slack[succ], position[succ], succ))
+
+    while ready or running:
+        while running and running[0][0] <= semester:
+            _, _, node = heapq.heappop(running)
+            release(node)
+
+        while ready and (len(running) < max_concurrent or effort[ready[0][2]] == 0):
+            _, _, node = heapq.heappop(ready)
+            start[node] = semester
+            if effort[node] == 0:
+                release(node)
+            else:
+                heapq.heappush(running, (semester + effort[node], position[node], node))
+
+        if running:
+            semesters.append(sorted((node for _, _, node in running), key=position.get))
+            semester += 1
+
+    return StudyPlan(semesters, start, critical_path, slack, length)
@@ -0,0 +1,287 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from roadmap_compact import CATEGORIES, CompactRoadmap
+
+_WORD = re.compile(r"[0-9a-z]+")
+PREFIX_WEIGHT = 0.8
+
+# Postings map each vocabulary term to the documents containing it. A document is a
+# subject name or a book (title and author); fields are tracked so hits can say what matched.
+SUBJECT_NAME, BOOK_TITLE, BOOK_AUTHOR = 1, 2, 4
+
+
+def tokenize(text: str) -> List[str]:
+    # Accents are folded so "Pólya" and "Polya" index the same term
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _WORD.findall(text)
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"$${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def letter_mask(term: str) -> int:
+    # One bit per distinct character of a tokenized term (digits and a-z)
+    mask = 0
+    for ch in set(term):
+        mask |= 1 << (ord(ch) - (48 if ch <= "9" else 87))
+    return mask
+
+
+def _bit_count(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8)).reshape(len(values), -1).sum(axis=1)
+
+
+def max_typos(term: str) -> int:
+    return 0 if len(term) <= 2 else 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    # Optimal string alignment distance (adjacent transpositions count once), cut off above limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous = previous, current
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+class SearchHit:
+    __slots__ = ("subject_id", "subject", "title", "author", "category", "score", "fields")
+
+    def __init__(self, subject_id: str, subject: str, title: str, author: str, category: str,
+                 score: float, fields: int):
+        self.subject_id = subject_id
+        self.subject = subject
+        self.title = title
+        self.author = author
+        self.category = category
+        self.score = score
+        self.fields = fields
+
+    def __repr__(self):
+        if self.title:
+            return f"SearchHit({self.title!r} by {self.author!r}, {self.subject!r}, {self.category})"
+        return f"SearchHit(subject {self.subject!r}, {self.category})"
+
+
+class SearchIndex:
+    # Each subject contributes one document for its name and one per book (title + author).
+    # Term ids are stable, so subjects can be added or removed without rebuilding: only the
+    # postings of their own terms change. Queries only touch the postings of the terms they match.
+    def __init__(self, category_names: Sequence[str] = CATEGORIES):
+        self.category_rank = {name: i for i, name in enumerate(category_names)}
+        self.terms: List[str] = []
+        self.term_index: Dict[str, int] = {}
+        self.sorted_terms: List[str] = []
+        self.postings: List[Dict[int, int]] = []
+        self.grams: Dict[str, List[int]] = {}
+        self.lengths: Dict[int, List[int]] = {}
+        self.length_masks: Dict[int, List[int]] = {}
+        # Array copies of a length bucket's term ids and letter masks, rebuilt when it grows
+        self._buckets: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # doc id -> (subject_id, subject name, title, author, category), None once removed
+        self.docs: List[Optional[Tuple[Hashable, str, str, str, str]]] = []
+        self.doc_terms: List[List[int]] = []
+        self.doc_ranks: List[int] = []
+        self.subject_docs: Dict[Hashable, List[int]] = {}
+        # Array copies of a term's postings (doc ids, fields), dropped whenever they change
+        self._posting_arrays: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._rank_array = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_roadmap(cls, roadmap: CompactRoadmap) -> "SearchIndex":
+        index = cls(roadmap.category_names)
+        for i, subject_id in enumerate(roadmap.ids):
+            if roadmap.names[i] >= 0:
+                index._add(subject_id, roadmap.name(i), roadmap.category(i), roadmap.books(i))
+        return index
+
+    @classmethod
+    def from_subjects(cls, subjects) -> "SearchIndex":
+        index = cls()
+        for subject_id, subject in subjects.items():
+            index.add_subject(subject_id, subject)
+        return index
+
+    def _term(self, term: str) -> int:
+        t = self.term_index.get(term)
+        if t is None:
+            t = len(self.terms)
+            self.terms.append(term)
+            self.term_index[term] = t
+            self.postings.append({})
+            insort(self.sorted_terms, term)
+            for gram in trigrams(term):
+                self.grams.setdefault(gram, []).append(t)
+            self.lengths.setdefault(len(term), []).append(t)
+            self.length_masks.setdefault(len(term), []).append(letter_mask(term))
+            self._buckets.pop(len(term), None)
+        return t
+
+    def _document(self, record: Tuple[Hashable, str, str, str, str], fields: List[Tuple[str, int]]) -> int:
+        doc = len(self.docs)
+        self.docs.append(record)
+        self.doc_ranks.append(self.category_rank.get(record[4], len(self.category_rank)))
+        terms = []
+        for text, field in fields:
+            for term in tokenize(text):
+                t = self._term(term)
+                postings = self.postings[t]
+                if doc not in postings:
+                    terms.append(t)
+                postings[doc] = postings.get(doc, 0) | field
+                self._posting_arrays.pop(t, None)
+        self.doc_terms.append(terms)
+        return doc
+
+    def _add(self, subject_id: Hashable, name: str, category: str, books: Sequence[Tuple[str, str, str]]):
+        docs = [self._document((subject_id, name, "", "", category), [(name, SUBJECT_NAME)])]
+        for title, author, book_category in books:
+            docs.append(self._document((subject_id, name, title, author, book_category),
+                                       [(title, BOOK_TITLE), (author, BOOK_AUTHOR)]))
+        self.subject_docs[subject_id] = docs
+
+    def add_subject(self, subject_id: Hashable, subject):
+        # Replaces whatever the index held for subject_id
+        self.remove_subject(subject_id)
+        self._add(subject_id, subject.name, subject.category,
+                  [(book.title, book.author, book.category) for book in subject.books])
+
+    def remove_subject(self, subject_id: Hashable):
+        # Terms stay in the vocabulary with empty postings; they simply stop matching
+        for doc in self.subject_docs.pop(subject_id, ()):
+            for t in self.doc_terms[doc]:
+                del self.postings[t][doc]
+                self._posting_arrays.pop(t, None)
+            self.docs[doc] = None
+            self.doc_terms[doc] = []
+
+    def expand(self, term: str, prefix: bool = False) -> Dict[int, float]:
+        # Vocabulary terms a query term stands for, with a weight: exact 1, prefix, then typo matches
+        matches = {}
+        exact = self.term_index.get(term)
+        if exact is not None:
+            matches[exact] = 1.0
+        if prefix:
+            i = bisect_left(self.sorted_terms, term)
+            while i < len(self.sorted_terms) and self.sorted_terms[i].startswith(term):
+                matches.setdefault(self.term_index[self.sorted_terms[i]], PREFIX_WEIGHT)
+                i += 1
+
+        limit = max_typos(term)
+        if limit:
+            # q-gram lemma: a substitution destroys at most three trigrams of the padded term and
+            # an adjacent transposition four. Short terms may share none with a match, so those
+            # are checked against every term of a compatible length instead.
+            grams = trigrams(term)
+            needed = len(grams) - 4 * limit
+            if needed > 0:
+                shared = Counter()
+                for gram in grams:
+                    shared.update(self.grams.get(gram, ()))
+                candidates = [t for t, count in shared.items() if count >= needed]
+            else:
+                # Every distinct letter of term missing from a match costs its own edit
+                absent = np.uint64(letter_mask(term))
+                candidates = []
+                for length in range(len(term) - limit, len(term) + limit + 1):
+                    ids, masks = self._bucket(length)
+                    candidates.extend(ids[_bit_count(absent & ~masks) <= limit].tolist())
+            for t in candidates:
+                if t in matches:
+                    continue
+                distance = edit_distance(term, self.terms[t], limit)
+                if distance <= limit:
+                    matches[t] = 1.0 - distance / (len(term) + 1)
+        return matches
+
+    def _bucket(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        bucket = self._buckets.get(length)
+        if bucket is None:
+            bucket = (np.array(self.lengths.get(length, ()), dtype=np.int64),
+                      np.array(self.length_masks.get(length, ()), dtype=np.uint64))
+            self._buckets[length] = bucket
+        return bucket
+
+    def _postings(self, t: int) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._posting_arrays.get(t)
+        if arrays is None:
+            postings = self.postings[t]
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.int64, count=len(postings)))
+            self._posting_arrays[t] = arrays
+        return arrays
+
+    def _matches(self, word: str, prefix: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Sorted unique docs matching one query word, with their best weight and matched fields
+        expanded = [(self._postings(t), weight) for t, weight in self.expand(word, prefix).items()]
+        docs = np.concatenate([postings[0] for postings, _ in expanded] or [np.zeros(0, dtype=np.int64)])
+        if not len(docs):
+            return docs, np.zeros(0), docs
+        fields = np.concatenate([postings[1] for postings, _ in expanded])
+        weights = np.repeat([weight for _, weight in expanded], [len(postings[0]) for postings, _ in expanded])
+        order = np.lexsort((-weights, docs))
+        docs, weights, fields = docs[order], weights[order], fields[order]
+        first = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        return docs[first], weights[first], np.bitwise_or.reduceat(fields, first)
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        # Every query word must match; ties within a category go to the better-scoring document
+        words = tokenize(query)
+        if not words:
+            return []
+        docs, scores, fields = self._matches(words[0], prefix=len(words) == 1)
+        for position, word in enumerate(words[1:], 1):
+            more_docs, more_scores, more_fields = self._matches(word, prefix=position == len(words) - 1)
+            docs, kept, more = np.intersect1d(docs, more_docs, assume_unique=True, return_indices=True)
+            scores = scores[kept] + more_scores[more]
+            fields = fields[kept] | more_fields[more]
+            if not len(docs):
+                return []
+        if not len(docs):
+            return []
+
+        if len(self._rank_array) != len(self.doc_ranks):
+            self._rank_array = np.array(self.doc_ranks, dtype=np.int64)
+        # Category rank first, then score, then doc id; ordered in one vectorized pass
+        ranked = np.lexsort((docs, -scores, self._rank_array[docs]))[:limit]
+        return [SearchHit(*self.docs[docs[i]], float(scores[i]), int(fields[i])) for i in ranked]
+
+
+def format_hits(hits: List[SearchHit]) -> str:
+    # One markdown block for the whole result list
+    lines = []
+    for hit in hits:
+        if hit.title:
+            lines.append(f"- **{hit.title}** by {hit.author} · {hit.subject} ({hit.category})")
+        else:
+            lines.append(f"- Subject: **{hit.subject}** ({hit.category})")
+    return "\n".join(lines)
+
+
+def search_box(index: SearchIndex, limit: int = 20):
+    import streamlit as st
+
+    query = st.text_input("Search books, authors and subjects")
+    if query:
+        hits = index.search(query, limit)
+        st.markdown(format_hits(hits) if hits else "No matches.")
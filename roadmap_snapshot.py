@@ -0,0 +1,141 @@
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Hashable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from roadmap_compact import CompactRoadmap
+
+MAGIC = b"MRSNAP\0\0"
+VERSION = 1
+ALIGNMENT = 64
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<16s8sQQ")
+
+# Layout of a snapshot file:
+#   header   magic, format version, number of sections
+#   table    one entry per section: name, NumPy dtype string, byte offset, item count
+#   data     each section's raw little-endian array, 64-byte aligned
+# Strings are stored as an int64 offsets array plus one UTF-8 blob per table.
+
+
+class MappedStringTable:
+    # Read-only StringTable over a mapped blob; strings are decoded on access
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self._index = None
+
+    def __getitem__(self, code: int) -> str:
+        return self.data[self.offsets[code]:self.offsets[code + 1]].tobytes().decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        for code in range(len(self)):
+            yield self[code]
+
+    @property
+    def index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {value: code for code, value in enumerate(self)}
+        return self._index
+
+
+def _encode_strings(strings: Sequence[str]):
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def write_snapshot(path: str, roadmap: CompactRoadmap, pos: Optional[Dict[Hashable, np.ndarray]] = None):
+    sections = {
+        "names": roadmap.names,
+        "categories": roadmap.categories,
+        "book_offsets": roadmap.book_offsets,
+        "book_titles": roadmap.book_titles,
+        "book_authors": roadmap.book_authors,
+        "book_categories": roadmap.book_categories,
+        "edge_sources": roadmap.edge_sources,
+        "edge_targets": roadmap.edge_targets,
+        "succ_offsets": roadmap.succ_offsets,
+        "succ": roadmap.succ,
+        "pred_offsets": roadmap.pred_offsets,
+        "pred": roadmap.pred,
+    }
+    sections["id_offsets"], sections["id_data"] = _encode_strings(list(roadmap.ids))
+    sections["str_offsets"], sections["str_data"] = _encode_strings(list(roadmap.strings))
+    sections["cat_offsets"], sections["cat_data"] = _encode_strings(list(roadmap.category_names))
+
+    layout = roadmap.layout
+    if pos is not None:
+        layout = np.array([pos.get(subject_id, (np.nan, np.nan)) for subject_id in roadmap.ids], dtype=np.float64)
+    if layout is not None:
+        sections["layout"] = np.asarray(layout, dtype=np.float64).reshape(-1)
+
+    arrays = [(name, np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<")))
+              for name, array in sections.items()]
+    offset = _HEADER.size + _SECTION.size * len(arrays)
+    table = []
+    for name, array in arrays:
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        table.append((name, array, offset))
+        offset += array.nbytes
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(table)))
+            for name, array, start in table:
+                f.write(_SECTION.pack(name.encode("ascii"), array.dtype.str.encode("ascii"), start, array.size))
+            for name, array, start in table:
+                f.write(b"\0" * (start - f.tell()))
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_snapshot(path: str) -> CompactRoadmap:
+    # Every array is a view into one shared read-only mapping, so worker processes
+    # loading the same file share its pages and nothing is parsed up front.
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a roadmap snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported roadmap snapshot version {version}, expected {VERSION}")
+
+    sections = {}
+    for i in range(count):
+        name, dtype, start, size = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+        name = name.rstrip(b"\0").decode("ascii")
+        sections[name] = np.frombuffer(buffer, dtype=np.dtype(dtype.rstrip(b"\0").decode("ascii")),
+                                       count=size, offset=start)
+
+    ids = MappedStringTable(sections["id_offsets"], sections["id_data"])
+    strings = MappedStringTable(sections["str_offsets"], sections["str_data"])
+    category_names = list(MappedStringTable(sections["cat_offsets"], sections["cat_data"]))
+    layout = sections.get("layout")
+    if layout is not None:
+        layout = layout.reshape(-1, 2)
+
+    return CompactRoadmap(ids, sections["names"], sections["categories"], sections["book_offsets"],
+                          sections["book_titles"], sections["book_authors"], sections["book_categories"],
+                          sections["edge_sources"], sections["edge_targets"], strings, category_names,
+                          csr=(sections["succ_offsets"], sections["succ"], sections["pred_offsets"], sections["pred"]),
+                          layout=layout)
+
+
+def compile_snapshot(path: str, subjects, connections, pos: Optional[Dict[Hashable, np.ndarray]] = None):
+    write_snapshot(path, CompactRoadmap.from_subjects(subjects, connections), pos)
@@ -0,0 +1,93 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from mathematics_roadmap import Book, Subject
+
+TRACK_NAMES = ["Philosophy", "Core Mathematics", "Logic and Foundations", "Algebra", "Pure Mathematics",
+               "Geometry", "Applied Mathematics", "Programming and Applications"]
+TOPICS = ["Logic", "Set Theory", "Algebra", "Linear Algebra", "Analysis", "Topology", "Geometry",
+          "Number Theory", "Combinatorics", "Probability", "Statistics", "Dynamics", "Optimization",
+          "Category Theory", "Measure Theory", "Computation"]
+TITLE_PATTERNS = ["Introduction to {}", "{}: A First Course", "Advanced {}", "Lectures on {}",
+                  "Problems in {}", "Elements of {}", "{} Done Right", "A Course in {}"]
+SURNAMES = ["Halmos", "Rudin", "Strang", "Lang", "Munkres", "Spivak", "Tao", "Axler", "Artin", "Knuth",
+            "Feller", "Enderton", "Awodey", "Stewart", "Royden", "Hatcher", "Lee", "Dummit", "Hardy", "Polya"]
+INITIALS = "ABCDEGHJKLMNPRST"
+
+# Category mix of the hand-written roadmap: mostly essential subjects, books a little more varied
+SUBJECT_CATEGORIES = (["essential", "recommended", "optional"], [0.75, 0.15, 0.10])
+BOOK_CATEGORIES = (["essential", "recommended", "optional"], [0.55, 0.30, 0.15])
+
+
+def generate_roadmap(n: int, seed: int = 0, tracks: int = len(TRACK_NAMES), prerequisites: float = 1.3,
+                     books: float = 4.0, cross_track: float = 0.15,
+                     window: int = 64) -> Tuple[Dict[str, Subject], List[Tuple[str, str]], Dict[str, List[str]]]:
+    # Subjects are numbered in a valid study order and every edge points forward, so the
+    # result is a DAG rooted at Start1/Start2 like the real roadmap. Prerequisites come from
+    # the recent subjects of the same track (occasionally another track), which gives the
+    # long, track-shaped chains and moderate fan-in of the hand-made data.
+    if n < 2:
+        raise ValueError("A synthetic roadmap needs at least the two start subjects")
+    rng = np.random.default_rng(seed)
+    names = [TRACK_NAMES[i] if i < len(TRACK_NAMES) else f"Track {i + 1}" for i in range(tracks)]
+    ids = ["Start1", "Start2"] + [f"Subject{i}" for i in range(2, n)]
+
+    track_of = rng.integers(0, tracks, size=n)
+    subject_category = rng.choice(SUBJECT_CATEGORIES[0], size=n, p=SUBJECT_CATEGORIES[1])
+    prereq_count = np.clip(rng.poisson(prerequisites, size=n), 1, 5)
+    book_count = np.clip(rng.poisson(books, size=n), 0, 12)
+    topic_of = rng.integers(0, len(TOPICS), size=n)
+
+    # Random draws are made up front; the loop only indexes into them
+    draws = int(prereq_count.sum())
+    other_track = rng.random(draws) < cross_track
+    back = rng.integers(0, window, size=draws)
+    anywhere = rng.random(draws)
+
+    members: List[List[int]] = [[] for _ in range(tracks)]
+    connections = []
+    d = 0
+    for i in range(2, n):
+        own = members[track_of[i]]
+        chosen = set()
+        for _ in range(prereq_count[i]):
+            if own and not other_track[d]:
+                chosen.add(own[-1 - back[d] % min(window, len(own))])
+            else:
+                low = max(2, i - window * tracks)
+                chosen.add(low + int(anywhere[d] * (i - low)) if i > low else int(track_of[i]) % 2)
+            d += 1
+        if not own:
+            chosen = {int(track_of[i]) % 2}
+        connections.extend((ids[j], ids[i]) for j in sorted(chosen))
+        own.append(i)
+
+    total_books = int(book_count.sum())
+    patterns = rng.integers(0, len(TITLE_PATTERNS), size=total_books)
+    surnames = rng.integers(0, len(SURNAMES), size=total_books)
+    initials = rng.integers(0, len(INITIALS), size=total_books)
+    book_categories = rng.choice(BOOK_CATEGORIES[0], size=total_books, p=BOOK_CATEGORIES[1])
+
+    subjects = {}
+    b = 0
+    for i, subject_id in enumerate(ids):
+        topic = TOPICS[topic_of[i]]
+        if i < 2:
+            subjects[subject_id] = Subject(f"Start {i + 1}", "essential", [])
+            continue
+        shelf = []
+        for k in range(book_count[i]):
+            # Consecutive patterns (then volumes) keep titles unique within a subject
+            pattern = TITLE_PATTERNS[(patterns[b - k] + k) % len(TITLE_PATTERNS)]
+            title = f"{pattern.format(topic)} {i}"
+            if k >= len(TITLE_PATTERNS):
+                title += f", Volume {k // len(TITLE_PATTERNS) + 1}"
+            shelf.append(Book(title, f"{INITIALS[initials[b]]}. {SURNAMES[surnames[b]]}", str(book_categories[b])))
+            b += 1
+        subjects[subject_id] = Subject(f"{topic} {i}", str(subject_category[i]), shelf)
+
+    track_members = {name: [] for name in names}
+    for i in range(2, n):
+        track_members[names[track_of[i]]].append(ids[i])
+    return subjects, connections, track_members
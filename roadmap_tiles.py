@@ -0,0 +1,193 @@
+import hashlib
+import io
+import os
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from mathematics_roadmap import BORDERS, COLORS
+from roadmap_cache import DEFAULT_CACHE_DIR, RoadmapCache
+from roadmap_render import UNKNOWN_BORDER, UNKNOWN_FILL, category_palette, draw_arrowheads, roadmap_arrays
+
+TILE_SIZE = 256
+DPI = 100
+
+# Level of detail, in on-screen pixels of a node's radius at the tile's zoom level
+LABEL_MIN_RADIUS = 14
+ARROW_MIN_RADIUS = 6
+MERGE_GRID = 3
+
+
+class TileRenderer:
+    # Zoom level z splits the square around the layout into 2^z x 2^z tiles of TILE_SIZE pixels,
+    # tile (0, 0) being the top-left. Tiles are cached by content hash, so a data or layout
+    # change yields new keys while unchanged roadmaps keep hitting the same entries.
+    def __init__(self, G, pos: Dict[Hashable, np.ndarray], cache: Optional[RoadmapCache] = None,
+                 tile_size: int = TILE_SIZE, max_zoom: int = 6, node_radius: float = 0.012):
+        self.tile_size = tile_size
+        self.max_zoom = max_zoom
+        self.cache = cache if cache is not None else RoadmapCache(
+            os.path.join(DEFAULT_CACHE_DIR, "tiles"), max_entries=1024, max_disk_bytes=512 * 1024 * 1024)
+        self.node_radius_fraction = node_radius
+        self._load(G, pos)
+        # Tiles default to the content hash; update() re-keys only the tiles an edit touched
+        self.base_hash = self.content_hash
+        self._versions: Dict[Tuple[int, int, int], str] = {}
+
+    def _load(self, G, pos: Dict[Hashable, np.ndarray], keep_frame: bool = False):
+        self.G = G
+        self.nodes, self.xy, self.codes, self.edges = roadmap_arrays(G, pos)
+        self.labels = [G.nodes[node].get("name", node) for node in self.nodes]
+
+        if len(self.xy):
+            lo, hi = self.xy.min(axis=0), self.xy.max(axis=0)
+        else:
+            lo, hi = np.zeros(2), np.ones(2)
+        # An edit that stays inside the current frame keeps it, so untouched tiles stay valid
+        if not (keep_frame and (lo >= self.origin).all() and (hi <= self.origin + self.size).all()):
+            size = float((hi - lo).max()) or 1.0
+            self.size = size * 1.1
+            self.origin = (lo + hi) / 2 - self.size / 2
+            self.node_radius = self.node_radius_fraction * self.size
+
+        digest = hashlib.sha256()
+        for array in (self.xy, self.codes, self.edges):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update("\0".join(map(str, self.labels)).encode("utf-8"))
+        digest.update(repr((self.tile_size, self.node_radius_fraction, self.size,
+                            tuple(self.origin))).encode("utf-8"))
+        self.content_hash = digest.hexdigest()
+
+    def update(self, G, pos: Dict[Hashable, np.ndarray],
+               dirty: Optional[Tuple[float, float, float, float]] = None) -> int:
+        # `dirty` bounds everything the edit changed, old and new positions alike, in layout
+        # coordinates. Tiles overlapping it get keys from the new content hash; the rest keep
+        # theirs and stay cached. Returns how many tiles were re-keyed (-1: all of them).
+        size, origin = self.size, self.origin
+        self._load(G, pos, keep_frame=dirty is not None)
+        if dirty is None or self.size != size or not np.array_equal(self.origin, origin):
+            self.base_hash = self.content_hash
+            self._versions.clear()
+            return -1
+        margin = self.node_radius * 2
+        view = (dirty[0] - margin, dirty[1] - margin, dirty[2] + margin, dirty[3] + margin)
+        count = 0
+        for z in range(self.max_zoom + 1):
+            for x, y in self.visible_tiles(z, view):
+                self._versions[(z, x, y)] = self.content_hash
+                count += 1
+        return count
+
+    def tile_bounds(self, z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+        span = self.size / (1 << z)
+        x0 = self.origin[0] + x * span
+        y1 = self.origin[1] + self.size - y * span
+        return x0, y1 - span, x0 + span, y1
+
+    def visible_tiles(self, z: int, view: Tuple[float, float, float, float]) -> List[Tuple[int, int]]:
+        # Tiles overlapping a (xmin, ymin, xmax, ymax) viewport in layout coordinates
+        span = self.size / (1 << z)
+        last = (1 << z) - 1
+        x_first = int(np.clip((view[0] - self.origin[0]) // span, 0, last))
+        x_last = int(np.clip((view[2] - self.origin[0]) // span, 0, last))
+        y_first = int(np.clip((self.origin[1] + self.size - view[3]) // span, 0, last))
+        y_last = int(np.clip((self.origin[1] + self.size - view[1]) // span, 0, last))
+        return [(x, y) for y in range(y_first, y_last + 1) for x in range(x_first, x_last + 1)]
+
+    def tile_key(self, z: int, x: int, y: int) -> str:
+        version = self._versions.get((z, x, y), self.base_hash)
+        return hashlib.sha256(f"{version}/{z}/{x}/{y}".encode("ascii")).hexdigest()
+
+    def tile(self, z: int, x: int, y: int) -> bytes:
+        return self.cache.get_or_compute(self.tile_key(z, x, y), lambda: self.render_tile(z, x, y))
+
+    def prerender(self, max_zoom: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        # Only tiles that actually contain part of the roadmap are rendered ahead of time
+        for z in range((self.max_zoom if max_zoom is None else max_zoom) + 1):
+            span = self.size / (1 << z)
+            cells = np.floor((self.xy - self.origin) / span).astype(np.int64)
+            occupied = {(int(cx), (1 << z) - 1 - int(cy)) for cx, cy in cells}
+            for x, y in sorted(occupied):
+                self.tile(z, x, y)
+                yield z, x, y
+
+    def render_tile(self, z: int, x: int, y: int) -> bytes:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+
+        x0, y0, x1, y1 = self.tile_bounds(z, x, y)
+        pixels_per_unit = self.tile_size / (x1 - x0)
+        radius_px = self.node_radius * pixels_per_unit
+        margin = self.node_radius * 2
+
+        fig = Figure(figsize=(self.tile_size / DPI, self.tile_size / DPI), dpi=DPI)
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+        ax.axis("off")
+
+        xy, edges = self.xy, self.edges
+        if len(edges):
+            # Keep edges whose bounding box touches the tile
+            lo = np.minimum(xy[edges[:, 0]], xy[edges[:, 1]])
+            hi = np.maximum(xy[edges[:, 0]], xy[edges[:, 1]])
+            hit = (hi[:, 0] >= x0 - margin) & (lo[:, 0] <= x1 + margin) & \
+                  (hi[:, 1] >= y0 - margin) & (lo[:, 1] <= y1 + margin)
+            tile_edges = edges[hit]
+
+            # Coarse zoom: edges whose ends snap to the same few-pixel cells are drawn once,
+            # with a width that grows with the number of edges merged into them
+            grid = MERGE_GRID / pixels_per_unit
+            snapped = np.round(xy[tile_edges] / grid).astype(np.int64).reshape(-1, 4)
+            merged, counts = np.unique(snapped, axis=0, return_counts=True)
+            segments = merged.reshape(-1, 2, 2) * grid
+            widths = np.minimum(1.5 * radius_px / LABEL_MIN_RADIUS, 1.5) * (1 + np.log2(counts))
+            ax.add_collection(LineCollection(segments, colors="gray", linewidths=np.maximum(widths, 0.3), zorder=1))
+
+        inside = (xy[:, 0] >= x0 - margin) & (xy[:, 0] <= x1 + margin) & \
+                 (xy[:, 1] >= y0 - margin) & (xy[:, 1] <= y1 + margin)
+        nodes = np.flatnonzero(inside)
+        if len(nodes):
+            size = (2 * max(radius_px, 1.0) * 72.0 / DPI) ** 2
+            codes = self.codes[nodes]
+            ax.scatter(xy[nodes, 0], xy[nodes, 1], s=size, marker="o",
+                       c=category_palette(COLORS, UNKNOWN_FILL)[codes],
+                       edgecolors=category_palette(BORDERS, UNKNOWN_BORDER)[codes],
+                       linewidths=min(1.0, radius_px / 4), zorder=2)
+            if radius_px >= LABEL_MIN_RADIUS:
+                font_size = min(radius_px / 3, 12)
+                for i in nodes:
+                    ax.text(xy[i, 0], xy[i, 1], self.labels[i], fontsize=font_size,
+                            ha="center", va="center", zorder=3, clip_on=True)
+
+        if radius_px >= ARROW_MIN_RADIUS and len(edges) and len(tile_edges):
+            points = radius_px * 72.0 / DPI
+            draw_arrowheads(ax, xy, tile_edges, points, points * 0.5, points * 0.25)
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=DPI)
+        return buffer.getvalue()
+
+
+def tile_viewer(renderer: TileRenderer, columns: int = 3, rows: int = 3):
+    import streamlit as st
+
+    # Pan/zoom controls pick a viewport; only the tiles it overlaps are rendered and sent
+    z = st.sidebar.slider("Zoom", 0, renderer.max_zoom, 0)
+    cx = st.sidebar.slider("Pan horizontally", 0.0, 1.0, 0.5)
+    cy = st.sidebar.slider("Pan vertically", 0.0, 1.0, 0.5)
+
+    span = renderer.size / (1 << z)
+    half_width = min(columns * span, renderer.size) / 2 * 0.999
+    half_height = min(rows * span, renderer.size) / 2 * 0.999
+    center_x = renderer.origin[0] + np.clip(cx * renderer.size, half_width, renderer.size - half_width)
+    center_y = renderer.origin[1] + np.clip((1 - cy) * renderer.size, half_height, renderer.size - half_height)
+    tiles = renderer.visible_tiles(z, (center_x - half_width, center_y - half_height,
+                                       center_x + half_width, center_y + half_height))
+
+    for y in sorted({y for _, y in tiles}):
+        row = [x for x, tile_y in tiles if tile_y == y]
+        for column, x in zip(st.columns(len(row), gap="small"), row):
+            column.image(renderer.tile(z, x, y))
@@ -0,0 +1,264 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from roadmap_consistency import Issue, normalize
+
+START_SUBJECTS = ("Start1", "Start2")
+
+
+class RoadmapValidator:
+    # Checks subjects/connections for cycles, dangling edges, subjects unreachable from the
+    # start nodes, duplicate books and categories missing from COLORS. The first run is
+    # O(V + E); after that each edit method re-checks only what the edit can affect, and
+    # issues() only walks the problems currently recorded.
+    def __init__(self, subjects, connections: Iterable[Tuple[Hashable, Hashable]], colors: Dict[str, str],
+                 starts: Iterable[Hashable] = START_SUBJECTS):
+        self.colors = colors
+        self.starts = tuple(starts)
+        self.subjects = {}
+        self.succ: Dict[Hashable, Dict[Hashable, int]] = {}
+        self.pred: Dict[Hashable, Dict[Hashable, int]] = {}
+        self._local: Dict[Hashable, List[Issue]] = {}
+        self._books: Dict[Tuple[str, str], Set[Hashable]] = {}
+        self._duplicated: Set[Tuple[str, str]] = set()
+        self._cycles: List[Issue] = []
+        # Nodes on or downstream of a cycle, as of the last _find_cycles()
+        self._cyclic: Set[Hashable] = set()
+        self._dangling: Set[Tuple[Hashable, Hashable]] = set()
+        self._repeated: Set[Tuple[Hashable, Hashable]] = set()
+        self._reachable: Set[Hashable] = set()
+        self._unreachable: Set[Hashable] = set()
+
+        for subject_id, subject in subjects.items():
+            self.subjects[subject_id] = subject
+            self._node(subject_id)
+            self._index_books(subject_id, subject, add=True)
+            self._set_local(subject_id, self._check_subject(subject_id, subject))
+        for start, end in connections:
+            self._link(start, end)
+        self._cycles = self._find_cycles()
+        self._reset_reachable()
+
+    def _node(self, node: Hashable):
+        if node in self.succ:
+            return
+        self.succ[node] = {}
+        self.pred[node] = {}
+        if node in self.starts:
+            # A start id appearing for the first time seeds reachability from itself
+            self._unreachable.difference_update(self._reach([node], self._reachable))
+
+    def _link(self, start: Hashable, end: Hashable):
+        self._node(start)
+        self._node(end)
+        count = self.succ[start].get(end, 0) + 1
+        self.succ[start][end] = count
+        self.pred[end][start] = count
+        if count > 1:
+            self._repeated.add((start, end))
+        self._check_edge(start, end)
+
+    def _check_edge(self, start: Hashable, end: Hashable):
+        if start in self.subjects and end in self.subjects:
+            self._dangling.discard((start, end))
+        else:
+            self._dangling.add((start, end))
+
+    def _check_incident(self, node: Hashable):
+        for end in self.succ[node]:
+            self._check_edge(node, end)
+        for start in self.pred[node]:
+            self._check_edge(start, node)
+
+    def _book_keys(self, subject) -> List[Tuple[str, str]]:
+        return [(normalize(book.title), normalize(book.author)) for book in subject.books]
+
+    def _index_books(self, subject_id: Hashable, subject, add: bool):
+        for key in self._book_keys(subject):
+            owners = self._books.setdefault(key, set())
+            if add:
+                owners.add(subject_id)
+            else:
+                owners.discard(subject_id)
+                if not owners:
+                    del self._books[key]
+            if len(owners) > 1:
+                self._duplicated.add(key)
+            else:
+                self._duplicated.discard(key)
+
+    def _set_local(self, subject_id: Hashable, issues: List[Issue]):
+        if issues:
+            self._local[subject_id] = issues
+        else:
+            self._local.pop(subject_id, None)
+
+    def _check_subject(self, subject_id: Hashable, subject) -> List[Issue]:
+        issues = []
+        if subject.category not in self.colors:
+            issues.append(Issue("unknown_category", subject_id,
+                                f"subject category {subject.category!r} has no colour in COLORS"))
+        seen = set()
+        for book, key in zip(subject.books, self._book_keys(subject)):
+            if book.category not in self.colors:
+                issues.append(Issue("unknown_category", subject_id,
+                                    f"{book.title!r} has category {book.category!r}, which has no colour in COLORS"))
+            if key in seen:
+                issues.append(Issue("duplicate_book", subject_id, f"{book.title!r} by {book.author} is listed twice"))
+            seen.add(key)
+        return issues
+
+    def _find_cycles(self) -> List[Issue]:
+        # Kahn's algorithm; whatever it cannot order lies on or behind a cycle, and
+        # walking predecessors inside that remainder always closes one
+        indegree = {node: len(preds) for node, preds in self.pred.items()}
+        queue = deque(node for node, degree in indegree.items() if degree == 0)
+        while queue:
+            u = queue.popleft()
+            for v in self.succ[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    queue.append(v)
+        remaining = {node for node, degree in indegree.items() if degree > 0}
+        self._cyclic = set(remaining)
+
+        # Walks start from, and step to, the smallest id, so the report depends only on the
+        # graph and not on the order the edges arrived in
+        issues = []
+        for node in sorted(remaining, key=str):
+            if node not in remaining:
+                continue
+            order = {}
+            while node not in order:
+                order[node] = len(order)
+                node = min((p for p in self.pred[node] if p in remaining), key=str)
+            cycle = list(order)[order[node]:][::-1]
+            issues.append(Issue("cycle", cycle[0], " -> ".join(map(str, cycle + [cycle[0]]))))
+            # Drop the cycle and everything it feeds so each cycle is reported once
+            stack = list(cycle)
+            while stack:
+                u = stack.pop()
+                if u in remaining:
+                    remaining.discard(u)
+                    stack.extend(v for v in self.succ[u] if v in remaining)
+        return issues
+
+    def _reach(self, sources: Iterable[Hashable], reached: Set[Hashable]) -> List[Hashable]:
+        # Extends `reached` in place and returns the nodes it added
+        queue = deque(node for node in set(sources) if node in self.succ and node not in reached)
+        reached.update(queue)
+        added = list(queue)
+        while queue:
+            u = queue.popleft()
+            for v in self.succ[u]:
+                if v not in reached:
+                    reached.add(v)
+                    added.append(v)
+                    queue.append(v)
+        return added
+
+    def _reset_reachable(self):
+        self._reachable = set()
+        self._reach(self.starts, self._reachable)
+        self._unreachable = {subject_id for subject_id in self.subjects if subject_id not in self._reachable}
+
+    def _path(self, start: Hashable, end: Hashable) -> Optional[List[Hashable]]:
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u == end:
+                path = []
+                while u is not None:
+                    path.append(u)
+                    u = parent[u]
+                return path[::-1]
+            for v in self.succ[u]:
+                if v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        return None
+
+    def issues(self) -> List[Issue]:
+        issues = []
+        for local in self._local.values():
+            issues.extend(local)
+        for key in sorted(self._duplicated):
+            owners = self._books[key]
+            issues.append(Issue("duplicate_book", sorted(owners, key=str)[0],
+                                f"{key[0]!r} by {key[1]} is listed under {', '.join(sorted(map(str, owners)))}"))
+        for start, end in sorted(self._dangling, key=str):
+            for endpoint in (start, end):
+                if endpoint not in self.subjects:
+                    issues.append(Issue("dangling_connection", endpoint,
+                                        f"connection {start} -> {end} names an undefined subject"))
+        for start, end in sorted(self._repeated, key=str):
+            issues.append(Issue("duplicate_connection", start,
+                                f"{start} -> {end} is listed {self.succ[start][end]} times"))
+        issues.extend(self._cycles)
+        for start in self.starts:
+            if start not in self.subjects:
+                issues.append(Issue("missing_start", start, "start subject is not defined"))
+        for subject_id in sorted(self._unreachable, key=str):
+            issues.append(Issue("unreachable", subject_id,
+                                f"cannot be reached from {' or '.join(map(str, self.starts))}"))
+        return issues
+
+    # Incremental edits
+
+    def set_subject(self, subject_id: Hashable, subject):
+        # Adding or editing a subject re-checks its books and categories and the edges
+        # touching it; reachability and cycles depend on edges alone and are unaffected
+        old = self.subjects.get(subject_id)
+        if old is not None:
+            self._index_books(subject_id, old, add=False)
+        self.subjects[subject_id] = subject
+        self._node(subject_id)
+        self._index_books(subject_id, subject, add=True)
+        self._set_local(subject_id, self._check_subject(subject_id, subject))
+        self._check_incident(subject_id)
+        if subject_id not in self._reachable and subject_id not in self.starts:
+            self._unreachable.add(subject_id)
+
+    def remove_subject(self, subject_id: Hashable):
+        # Its connections stay and become dangling, as they would in the source data
+        old = self.subjects.pop(subject_id)
+        self._index_books(subject_id, old, add=False)
+        self._local.pop(subject_id, None)
+        self._unreachable.discard(subject_id)
+        self._check_incident(subject_id)
+
+    def add_connection(self, start: Hashable, end: Hashable):
+        self._node(start)
+        self._node(end)
+        # The new edge closes a cycle exactly when end already reaches start. Cycles are then
+        # found again, so a region that already had one is still reported once; so are edges
+        # leaving a cyclic region, which can change the walk that picks each reported cycle.
+        changes = start in self._cyclic or (end not in self.succ[start] and self._path(end, start) is not None)
+        self._link(start, end)
+        if changes:
+            self._cycles = self._find_cycles()
+        if start in self._reachable:
+            self._unreachable.difference_update(self._reach([end], self._reachable))
+
+    def remove_connection(self, start: Hashable, end: Hashable):
+        count = self.succ[start][end] - 1
+        if count:
+            self.succ[start][end] = count
+            self.pred[end][start] = count
+            if count == 1:
+                self._repeated.discard((start, end))
+            return
+        del self.succ[start][end]
+        del self.pred[end][start]
+        self._dangling.discard((start, end))
+        # Removing an edge can only break cycles and cut off subjects downstream of it
+        if self._cycles:
+            self._cycles = self._find_cycles()
+        if start in self._reachable:
+            self._reset_reachable()
+
+
+def validate_roadmap(subjects, connections, colors: Dict[str, str],
+                     starts: Iterable[Hashable] = START_SUBJECTS) -> List[Issue]:
+    return RoadmapValidator(subjects, connections, colors, starts).issues()
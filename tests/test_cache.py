@@ -0,0 +1,50 @@
+import os
+import pickle
+import sys
+import threading
+
+from roadmap_cache import RoadmapCache
+
+
+def test_concurrent_lru_access(tmp_path):
+    # More keys than entries, so threads keep evicting what others are about to read
+    cache = RoadmapCache(str(tmp_path), max_entries=4)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(500):
+                key = str((i + offset) % 16)
+                assert cache.get_or_compute(key, lambda: key) == key
+        except Exception as error:
+            errors.append(error)
+
+    # Switch threads as often as possible so unguarded LRU updates interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert cache.hits + cache.misses == 8 * 500
+
+
+def test_unpicklable_value_stays_in_memory_only(tmp_path):
+    cache = RoadmapCache(str(tmp_path))
+    lock = threading.Lock()
+    cache.put("k", lock)
+    assert cache.get("k") is lock
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_pickles_without_its_entries(tmp_path):
+    cache = RoadmapCache(str(tmp_path))
+    cache.put("k", 1)
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get("k") == 1
+    assert copy.hits == 1
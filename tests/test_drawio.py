@@ -0,0 +1,35 @@
+import io
+
+import networkx as nx
+
+from mathematics_roadmap import COLORS, create_connections, create_math_roadmap, create_subjects
+from roadmap_drawio import read_drawio, write_drawio
+
+
+def _grid(G):
+    return {node: (i % 7, i // 7) for i, node in enumerate(G)}
+
+
+def test_round_trip_keeps_subjects_and_every_connection():
+    # Connections to ids no subject defines (AbstractAlgebra, AdvancedAnalysis) included
+    subjects, connections = create_subjects(), create_connections()
+    G = create_math_roadmap(subjects, connections)
+    buffer = io.StringIO()
+    write_drawio(buffer, G, _grid(G), subjects=subjects)
+    read_subjects, read_connections = read_drawio(io.StringIO(buffer.getvalue()), COLORS)
+    assert read_subjects == {subject_id: (subject.name, subject.category,
+                                          [(book.title, book.author, book.category) for book in subject.books])
+                             for subject_id, subject in subjects.items()}
+    assert sorted(read_connections) == sorted(G.edges())
+
+
+def test_subject_ids_do_not_collide_with_model_cells():
+    G = nx.DiGraph()
+    G.add_node("0", name="Zero", category="essential", books=[])
+    G.add_node("1", name="One", category="optional", books=[])
+    G.add_edge("0", "1")
+    buffer = io.StringIO()
+    write_drawio(buffer, G, _grid(G))
+    subjects, connections = read_drawio(io.StringIO(buffer.getvalue()), COLORS)
+    assert subjects == {"0": ("Zero", "essential", []), "1": ("One", "optional", [])}
+    assert connections == [("0", "1")]
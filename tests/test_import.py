@@ -0,0 +1,27 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+HEAVY = ("streamlit", "matplotlib", "networkx")
+# Generous for slow CI machines; a local import takes a few milliseconds
+IMPORT_BUDGET = 0.25
+
+SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import mathematics_roadmap
+seconds = time.perf_counter() - started
+print(json.dumps({"seconds": seconds, "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+def test_import_is_light_and_fast():
+    # A fresh interpreter, so nothing imported by the test session leaks into the check
+    result = subprocess.run([sys.executable, "-c", SCRIPT % (HEAVY,)], cwd=ROOT, capture_output=True,
+                            text=True, check=True, env={**os.environ, "PYTHONPATH": ROOT})
+    report = json.loads(result.stdout)
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET
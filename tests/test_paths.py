@@ -0,0 +1,29 @@
+import networkx as nx
+import pytest
+
+from mathematics_roadmap import create_math_roadmap
+from roadmap_paths import PathEngine
+
+
+def test_lru_costs_are_exact():
+    G = nx.DiGraph([("a", "b"), ("b", "c")])
+    engine = PathEngine(G, node_weight={"a": 0.1, "b": 0.2, "c": 0.0})
+    assert engine.cost("a", "c") == 0.1 + 0.2
+    assert engine.shortest_path("a", "c") == (0.1 + 0.2, ["a", "b", "c"])
+
+
+def test_precomputed_table_matches_lru():
+    G = create_math_roadmap()
+    lazy, table = PathEngine(G), PathEngine(G)
+    assert table.precompute()
+    for source in G:
+        assert table.distances(source) == pytest.approx(lazy.distances(source))
+        for target in G:
+            try:
+                expected = lazy.shortest_path(source, target)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    table.shortest_path(source, target)
+                continue
+            cost, path = table.shortest_path(source, target)
+            assert cost == pytest.approx(expected[0]) and path == expected[1]
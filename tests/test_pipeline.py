@@ -0,0 +1,39 @@
+from mathematics_roadmap import COLORS, Book, Subject, create_connections, create_subjects, tracks
+from roadmap_pipeline import RoadmapPipeline
+
+QUERIES = ["Halmos", "Linear Algebr", "topology", "Ploya", "Probability Theory", "Galois"]
+
+
+def _key(issues):
+    return sorted((issue.kind, str(issue.subject), issue.message) for issue in issues)
+
+
+def _state(pipeline):
+    G = pipeline.G
+    hits = {query: sorted((hit.subject_id, hit.title, hit.author, hit.score)
+                          for hit in pipeline.index.search(query, limit=10000)) for query in QUERIES}
+    return (_key(pipeline.issues()), sorted((str(node), sorted(G.nodes[node].items())) for node in G),
+            sorted(G.edges()), hits)
+
+
+def test_updates_match_a_fresh_pipeline():
+    subjects, connections = create_subjects(), create_connections()
+    pipeline = RoadmapPipeline(subjects, connections, COLORS, tracks, layout="layered")
+    galois = Subject("Galois Theory", "optional", [Book("Galois Theory", "Ian Stewart", "optional")])
+    steps = [
+        # add a subject, then remove it again
+        (dict(subjects, Galois=galois), connections + [("AbstractAlgebra", "Galois")]),
+        (subjects, connections),
+        # close a cycle, then break it
+        (subjects, connections + [("StochasticCalculus", "Start2")]),
+        (subjects, connections),
+        # edit books and drop a start subject
+        (dict(subjects, Calculus=Subject("Calculus", "essential", [Book("Calculus", "Spivak", "essential")])),
+         connections),
+        ({k: v for k, v in subjects.items() if k != "Start1"}, connections),
+        (subjects, connections),
+    ]
+    for new_subjects, new_connections in steps:
+        pipeline.update(new_subjects, new_connections)
+        fresh = RoadmapPipeline(new_subjects, new_connections, COLORS, tracks, pos=pipeline.pos)
+        assert _state(pipeline) == _state(fresh)
@@ -0,0 +1,16 @@
+from mathematics_roadmap import create_subjects
+from roadmap_search import SearchIndex, edit_distance
+
+
+def test_transposed_typo_is_found():
+    # "ploya" shares only two of six trigrams with "polya" but is one OSA edit away
+    index = SearchIndex.from_subjects(create_subjects())
+    assert edit_distance("ploya", "polya", 1) == 1
+    expected = [(hit.title, hit.author) for hit in index.search("Polya")]
+    assert expected
+    assert [(hit.title, hit.author) for hit in index.search("Ploya")] == expected
+
+
+def test_short_terms_match_without_shared_trigrams():
+    index = SearchIndex.from_subjects(create_subjects())
+    assert index.term_index["set"] in index.expand("est")
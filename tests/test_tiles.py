@@ -0,0 +1,39 @@
+import random
+import sys
+import threading
+
+from mathematics_roadmap import create_math_roadmap
+from roadmap_cache import RoadmapCache
+from roadmap_tiles import TileRenderer
+
+
+def test_tiles_from_concurrent_sessions(tmp_path):
+    # One renderer shared by every session, as the app keeps it in default_cache(); a small
+    # tile LRU makes concurrent panning evict constantly
+    G = create_math_roadmap()
+    pos = {node: (i % 7 / 7, i // 7 / 7) for i, node in enumerate(G)}
+    renderer = TileRenderer(G, pos, cache=RoadmapCache(str(tmp_path), max_entries=4), tile_size=64, max_zoom=2)
+    tiles = [(2, x, y) for x in range(4) for y in range(4)]
+    expected = {tile: renderer.render_tile(*tile) for tile in tiles}
+    errors = []
+
+    def session(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(40):
+                tile = rng.choice(tiles)
+                assert renderer.tile(*tile) == expected[tile]
+        except Exception as error:
+            errors.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        threads = [threading.Thread(target=session, args=(seed,)) for seed in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
@@ -0,0 +1,64 @@
+import random
+from collections import Counter
+
+import pytest
+
+from mathematics_roadmap import COLORS, Book, Subject
+from roadmap_validate import RoadmapValidator, validate_roadmap
+
+IDS = ["Start1", "Start2"] + [f"S{i}" for i in range(8)] + ["Undefined"]
+TITLES = ["Algebra", "Analysis", "Topology"]
+
+
+def _key(issues):
+    return sorted((issue.kind, str(issue.subject), issue.message) for issue in issues)
+
+
+def _subject(rng):
+    books = [Book(rng.choice(TITLES), rng.choice(["Lang", "Rudin"]), rng.choice(["essential", "fancy"]))
+             for _ in range(rng.randrange(3))]
+    return Subject(f"Subject {rng.randrange(100)}", rng.choice(["essential", "optional", "unknown"]), books)
+
+
+def _check(validator, subjects, connections):
+    assert _key(validator.issues()) == _key(validate_roadmap(subjects, connections.elements(), COLORS))
+
+
+def test_start_added_by_edit_is_reachable():
+    validator = RoadmapValidator({}, [], COLORS)
+    validator.set_subject("Start1", Subject("Start", "essential", []))
+    validator.set_subject("A", Subject("A", "essential", []))
+    validator.add_connection("Start1", "A")
+    assert not [issue for issue in validator.issues() if issue.kind == "unreachable"]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_incremental_edits_match_full_validation(seed):
+    rng = random.Random(seed)
+    subjects = {subject_id: _subject(rng) for subject_id in rng.sample(IDS, rng.randrange(len(IDS)))}
+    connections = Counter((rng.choice(IDS), rng.choice(IDS)) for _ in range(rng.randrange(6)))
+    connections = Counter({edge: count for edge, count in connections.items() if edge[0] != edge[1]})
+    validator = RoadmapValidator(subjects, connections.elements(), COLORS)
+    _check(validator, subjects, connections)
+
+    for _ in range(30):
+        action = rng.random()
+        if action < 0.3:
+            subject_id = rng.choice(IDS)
+            subjects[subject_id] = _subject(rng)
+            validator.set_subject(subject_id, subjects[subject_id])
+        elif action < 0.45 and subjects:
+            subject_id = rng.choice(sorted(subjects))
+            del subjects[subject_id]
+            validator.remove_subject(subject_id)
+        elif action < 0.8:
+            start, end = rng.sample(IDS, 2)
+            connections[(start, end)] += 1
+            validator.add_connection(start, end)
+        elif connections:
+            start, end = rng.choice(sorted(connections))
+            connections[(start, end)] -= 1
+            if not connections[(start, end)]:
+                del connections[(start, end)]
+            validator.remove_connection(start, end)
+        _check(validator, subjects, connections)